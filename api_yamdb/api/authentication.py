@@ -0,0 +1,82 @@
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from users import tokens
+from users.models import User
+
+
+class TokenUser(SimpleLazyObject):
+    """
+    Пользователь из утверждений access-токена. Роль и is_staff берутся
+    из токена: их смена отзывает токен. Полный объект User загружается
+    из БД при первом обращении к остальным атрибутам, включая username,
+    который можно сменить, не отзывая токен, — например, при сохранении
+    автора отзыва.
+    """
+
+    # Атрибуты, которые читаются из утверждений без запроса к БД.
+    CLAIM_ATTRIBUTES = ("role", "is_staff")
+
+    USER = User.USER
+    MODERATOR = User.MODERATOR
+    ADMIN = User.ADMIN
+    is_user = User.is_user
+    is_admin = User.is_admin
+    is_moderator = User.is_moderator
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: User.objects.get(pk=user_id))
+        # Запись в __dict__ напрямую: LazyObject передаёт присваивание
+        # атрибутов загруженному объекту.
+        self.__dict__.update(
+            {claim: token[claim] for claim in self.CLAIM_ATTRIBUTES},
+            id=user_id,
+            pk=user_id,
+        )
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, User) and other.pk == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без загрузки пользователя из БД. Токен отклоняется,
+    если версия в нём отстала от версии пользователя: она растёт при смене
+    роли, is_staff или is_active. Токены без утверждений (выданные раньше)
+    проверяются по БД, как в JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        if tokens.VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Токен не содержит идентификатора.")
+        version = tokens.get_token_version(user_id)
+        if version is None:
+            raise AuthenticationFailed(
+                "Пользователь не найден или не активен.",
+                code="user_not_found",
+            )
+        if version != validated_token[tokens.VERSION_CLAIM]:
+            raise AuthenticationFailed(
+                "Токен отозван: права пользователя изменились.",
+                code="token_revoked",
+            )
+        return TokenUser(validated_token)
@@ -0,0 +1,254 @@
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.db.models import Max
+from rest_framework import serializers
+
+from core import versions
+from core.loader import chunked
+from reviews import catalog, search
+from reviews.models import Title
+
+BULK_BATCH_SIZE = 500
+NOT_AN_OBJECT = "Ожидается JSON-объект произведения."
+DUPLICATE_ID = "Произведение с таким id уже есть в этом пакете."
+CHUNK_FAILED = "Пакет не сохранён: {error}"
+
+
+ID_FIELD = serializers.IntegerField(min_value=1)
+
+
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Проверяет одно произведение массовой загрузки. Категория и жанры
+    остаются slug: они разрешаются сразу для всего пакета.
+    """
+
+    id = serializers.IntegerField(required=False, min_value=1)
+    category = serializers.SlugField(required=False, allow_null=True)
+    genre = serializers.ListField(
+        child=serializers.SlugField(), required=False
+    )
+
+    class Meta:
+        model = Title
+        fields = ("id", "name", "year", "description", "genre", "category")
+
+
+class TitleBulkUpsert:
+    """
+    Создаёт и обновляет произведения пачками: на пачку приходится
+    один запрос существующих id, по запросу на разрешение slug,
+    bulk_create, bulk_update и пакетная правка жанров в одной транзакции.
+    Результат — список статусов в порядке входных элементов.
+    """
+
+    def __init__(self, batch_size=BULK_BATCH_SIZE, using=DEFAULT_DB_ALIAS):
+        self.batch_size = batch_size
+        self.using = using
+        self.connection = connections[using]
+
+    def run(self, items):
+        results = []
+        for chunk in chunked(items, self.batch_size):
+            results.extend(self.process_chunk(len(results), chunk))
+        return results
+
+    def process_chunk(self, offset, chunk):
+        results = [{"index": offset + index} for index in range(len(chunk))]
+        ids = self.parse_ids(chunk, results)
+        existing = Title.objects.using(self.using).in_bulk(ids.values())
+
+        valid = self.validate(chunk, ids, existing, results)
+        self.resolve_slugs(valid, results)
+        if not valid:
+            return results
+        try:
+            with transaction.atomic(using=self.using):
+                self.save(valid, existing)
+        except DatabaseError as exc:
+            for index, _ in valid:
+                results[index] = {
+                    "index": offset + index,
+                    "status": "error",
+                    "errors": {
+                        "non_field_errors": [CHUNK_FAILED.format(error=exc)]
+                    },
+                }
+            return results
+        for index, data in valid:
+            results[index]["id"] = data["title"].pk
+            results[index]["status"] = data["status"]
+        return results
+
+    def fail(self, results, index, errors):
+        results[index]["status"] = "error"
+        results[index]["errors"] = errors
+
+    def parse_ids(self, chunk, results):
+        """
+        Приводит id элементов к положительному int до поиска
+        существующих произведений: «1» считается id 1, а список
+        или отрицательное число — ошибкой элемента.
+        """
+        ids = {}
+        for index, item in enumerate(chunk):
+            if not isinstance(item, dict) or item.get("id") is None:
+                continue
+            try:
+                ids[index] = ID_FIELD.run_validation(item["id"])
+            except serializers.ValidationError as exc:
+                self.fail(results, index, {"id": exc.detail})
+        return ids
+
+    def validate(self, chunk, ids, existing, results):
+        valid = []
+        seen = set()
+        for index, item in enumerate(chunk):
+            if "errors" in results[index]:
+                continue
+            if not isinstance(item, dict):
+                self.fail(
+                    results, index, {"non_field_errors": [NOT_AN_OBJECT]}
+                )
+                continue
+            serializer = TitleBulkItemSerializer(
+                data=item, partial=ids.get(index) in existing
+            )
+            if not serializer.is_valid():
+                self.fail(results, index, serializer.errors)
+                continue
+            data = serializer.validated_data
+            pk = data.get("id")
+            if pk is not None:
+                if pk in seen:
+                    self.fail(results, index, {"id": [DUPLICATE_ID]})
+                    continue
+                seen.add(pk)
+            valid.append((index, data))
+        return valid
+
+    def resolve_slugs(self, valid, results):
+        """Подставляет объекты справочников вместо slug на всю пачку."""
+        categories = catalog.categories.get_many(
+            {data["category"] for _, data in valid if data.get("category")}
+        )
+        genres = catalog.genres.get_many(
+            {slug for _, data in valid for slug in data.get("genre", ())}
+        )
+        message = serializers.SlugRelatedField.default_error_messages[
+            "does_not_exist"
+        ]
+        resolved = []
+        for index, data in valid:
+            errors = {}
+            category = data.get("category")
+            if category and category not in categories:
+                errors["category"] = [
+                    message.format(slug_name="slug", value=category)
+                ]
+            if "genre" in data:
+                unknown = [
+                    slug for slug in data["genre"] if slug not in genres
+                ]
+                if unknown:
+                    errors["genre"] = [
+                        message.format(slug_name="slug", value=slug)
+                        for slug in dict.fromkeys(unknown)
+                    ]
+                else:
+                    data["genre"] = {genres[slug].pk for slug in data["genre"]}
+            if errors:
+                self.fail(results, index, errors)
+                continue
+            if "category" in data:
+                data["category"] = categories.get(category)
+            resolved.append((index, data))
+        valid[:] = resolved
+
+    def save(self, valid, existing):
+        # Запись версии первой берёт блокировку записи SQLite, поэтому
+        # выделение id ниже не пересекается с другими писателями.
+        versions.bump(versions.TITLES)
+        created, updated, update_fields = [], [], set()
+        for _, data in valid:
+            fields = {
+                name: value
+                for name, value in data.items()
+                if name not in ("id", "genre")
+            }
+            title = existing.get(data.get("id"))
+            if title is None:
+                title = Title(pk=data.get("id"), **fields)
+                data["status"] = "created"
+                created.append(title)
+            else:
+                for name, value in fields.items():
+                    setattr(title, name, value)
+                update_fields.update(fields)
+                data["status"] = "updated"
+                updated.append(title)
+            data["title"] = title
+
+        self.create_titles(created)
+        if updated and update_fields:
+            Title.objects.using(self.using).bulk_update(
+                updated, sorted(update_fields)
+            )
+        self.set_genres(
+            {
+                data["title"].pk: data["genre"]
+                for _, data in valid
+                if "genre" in data
+            },
+            replace={title.pk for title in updated},
+        )
+        search.index_titles(
+            [data["title"].pk for _, data in valid], self.using
+        )
+
+    def create_titles(self, titles):
+        if not titles:
+            return
+        manager = Title.objects.using(self.using)
+        explicit = any(title.pk is not None for title in titles)
+        if not self.connection.features.can_return_rows_from_bulk_insert:
+            # Без RETURNING id новых строк не узнать: выделяем их сами.
+            last = manager.aggregate(last=Max("pk"))["last"] or 0
+            last = max([last] + [title.pk for title in titles if title.pk])
+            for title in titles:
+                if title.pk is None:
+                    last += 1
+                    title.pk = last
+        manager.bulk_create(titles)
+        if explicit:
+            with self.connection.cursor() as cursor:
+                for sql in self.connection.ops.sequence_reset_sql(
+                    no_style(), [Title]
+                ):
+                    cursor.execute(sql)
+
+    def set_genres(self, genres, replace):
+        """
+        Применяет жанры пачки: у обновляемых произведений сверяет их
+        с текущими, удаляя и добавляя связи общими запросами.
+        """
+        through = Title.genre.through.objects.using(self.using)
+        current = {}
+        removed = []
+        if replace & genres.keys():
+            for pk, title_id, genre_id in through.filter(
+                title_id__in=replace & genres.keys()
+            ).values_list("pk", "title_id", "genre_id"):
+                if genre_id in genres[title_id]:
+                    current.setdefault(title_id, set()).add(genre_id)
+                else:
+                    removed.append(pk)
+        if removed:
+            through.filter(pk__in=removed).delete()
+        through.bulk_create(
+            [
+                Title.genre.through(title_id=title_id, genre_id=genre_id)
+                for title_id, wanted in genres.items()
+                for genre_id in wanted - current.get(title_id, set())
+            ]
+        )
@@ -1,13 +1,39 @@
-from django_filters.rest_framework import CharFilter, FilterSet
+from django.core.validators import EMPTY_VALUES
+from django_filters.rest_framework import CharFilter, FilterSet, OrderingFilter
 
+from reviews import catalog
 from reviews.models import Title
+from reviews.search import search_titles
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter с id последним ключом в направлении первого поля:
+    порядок однозначен, а индекс (поле, id) читается без сортировки.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        ordering = [self.get_ordering_value(param) for param in value]
+        tie = "-id" if ordering[0].startswith("-") else "id"
+        return qs.order_by(*ordering, tie)
 
 
 class TitleFilter(FilterSet):
     """Кастомный фильтр для произведений."""
 
-    genre = CharFilter(field_name="genre__slug")
-    category = CharFilter(field_name="category__slug")
+    genre = CharFilter(method="filter_genre")
+    category = CharFilter(method="filter_category")
+    search = CharFilter(method="filter_search")
+    ordering = StableOrderingFilter(
+        fields=(
+            ("rating_mean", "rating"),
+            ("rating_count", "reviews_count"),
+            ("year", "year"),
+            ("name", "name"),
+        )
+    )
 
     class Meta:
         model = Title
@@ -17,3 +43,18 @@ class TitleFilter(FilterSet):
             "category",
             "year",
         ]
+
+    def filter_genre(self, queryset, name, value):
+        genre = catalog.genres.get(value)
+        if genre is None:
+            return queryset.none()
+        return queryset.filter(genre=genre.pk)
+
+    def filter_category(self, queryset, name, value):
+        category = catalog.categories.get(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category_id=category.pk)
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
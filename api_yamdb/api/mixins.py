@@ -1,6 +1,17 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, urlencode
 from rest_framework import mixins, viewsets
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from core import routers
+from core.versions import get_validators
 
 from .permissions import IsAdminOrReadOnly
+from .serializers import get_sparse_fields
 
 
 class CreateUpdateDeleteViewSet(
@@ -14,3 +25,177 @@ class CreateUpdateDeleteViewSet(
     """Кастомный миксин для жанров и категорий."""
 
     permission_classes = (IsAdminOrReadOnly,)
+
+
+class ReplicaReadMixin:
+    """
+    GET и HEAD читают с реплики БД (core.routers), если клиент недавно
+    ничего не записывал. Аутентификация выполняется раньше и читает
+    пользователя из primary.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not routers.primary_required(
+            request
+        ):
+            routers.read_from_replica()
+
+
+class ConditionalGetMixin:
+    """
+    ETag и Last-Modified для list/retrieve по версиям коллекций.
+    Если клиент прислал актуальные валидаторы, возвращается 304
+    без обращения к queryset и сериализаторам. Last-Modified отдаётся
+    только для завершившейся секунды.
+    """
+
+    def get_version_keys(self):
+        raise NotImplementedError
+
+    def get_collection_validators(self):
+        """(etag, last_modified) коллекции, вычисляются один раз за запрос."""
+        if not hasattr(self, "_collection_validators"):
+            self._collection_validators = get_validators(
+                self.get_version_keys(),
+                salt=self.request.accepted_renderer.format,
+            )
+        return self._collection_validators
+
+    def conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_collection_validators()
+        etag = f'"{etag}"'
+        timestamp = last_modified and int(last_modified.timestamp())
+        if timestamp and timestamp >= int(timezone.now().timestamp()):
+            # Last-Modified точен до секунды: в текущей секунде возможна
+            # ещё одна запись, и If-Modified-Since с этим значением дал бы
+            # устаревший 304. Пока секунда не закончилась, заголовок
+            # не отдаётся и сверяется только ETag.
+            timestamp = None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+
+class CachedListMixin:
+    """
+    Кэширует сериализованную страницу списка по нормализованной строке
+    запроса. Ключ включает версию коллекции из ConditionalGetMixin,
+    поэтому любая запись в коллекцию делает старые страницы недоступными.
+    """
+
+    cache_namespace = None
+
+    @classmethod
+    def get_cache_stats(cls):
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        return {
+            name: cache.get(f"{cls.cache_namespace}:{name}", 0)
+            for name in ("hits", "misses")
+        }
+
+    def count(self, name):
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        key = f"{self.cache_namespace}:{name}"
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+    def get_cache_key(self, request):
+        etag, _ = self.get_collection_validators()
+        query = urlencode(
+            sorted(
+                (name, sorted(values))
+                for name, values in request.query_params.lists()
+            ),
+            doseq=True,
+        )
+        return f"{self.cache_namespace}:{etag}:{request.get_host()}?{query}"
+
+    def list(self, request, *args, **kwargs):
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            self.count("hits")
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+        self.count("misses")
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class SparseQueryMixin:
+    """
+    ?fields= и ?omit= для вьюсета: список полей ответа и сужение
+    запроса через only() до колонок, которые этим полям нужны.
+    """
+
+    def get_sparse_fields(self):
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = get_sparse_fields(
+                self.request, self.get_serializer_class().Meta.fields
+            )
+        return self._sparse_fields
+
+    def wants_field(self, name):
+        fields = self.get_sparse_fields()
+        return fields is None or name in fields
+
+    def get_sparse_columns(self, fields):
+        reader = getattr(self, "values_reader", None)
+        if reader is not None:
+            return reader.columns(fields)
+        return ["pk", *fields]
+
+    def sparse_queryset(self, queryset):
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        return queryset.only(*self.get_sparse_columns(fields))
+
+
+class ValuesListMixin(SparseQueryMixin):
+    """
+    Список только для чтения без создания моделей: страница читается
+    через values() только нужными колонками, а values_reader собирает
+    из строк тот же JSON, что и сериализатор. Запись и retrieve
+    по-прежнему идут через сериализаторы.
+    """
+
+    values_reader = None
+
+    def use_values_reader(self):
+        return self.values_reader is not None
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_reader():
+            return super().list(request, *args, **kwargs)
+        reader = self.values_reader
+        fields = reader.select(self.get_sparse_fields())
+        queryset = reader.values(
+            self.filter_queryset(self.get_queryset()), fields
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(reader.build(list(queryset), fields))
+        return self.get_paginated_response(reader.build(list(page), fields))
@@ -0,0 +1,132 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset-пагинация по паре (pub_date, id) от новых записей к старым.
+    Не выполняет COUNT(*) и OFFSET: страница выбирается диапазоном
+    по составному индексу, поэтому глубокие страницы не дороже первой.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Неверный курсор."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), PageNumberPagination.page_query_param
+        )
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor[0]
+
+        if reverse:
+            queryset = queryset.order_by("pub_date", "id")
+        else:
+            queryset = queryset.order_by("-pub_date", "-id")
+        if self.cursor is not None:
+            _, pub_date, pk = self.cursor
+            if reverse:
+                queryset = queryset.filter(pub_date__gte=pub_date).filter(
+                    Q(pub_date__gt=pub_date) | Q(id__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(pub_date__lte=pub_date).filter(
+                    Q(pub_date__lt=pub_date) | Q(id__lt=pk)
+                )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self.page[0])
+
+    def encode_cursor(self, reverse, obj):
+        # Страница может состоять из моделей или из строк values().
+        if isinstance(obj, dict):
+            pub_date, pk = obj["pub_date"], obj["id"]
+        else:
+            pub_date, pk = obj.pub_date, obj.pk
+        raw = f"{int(reverse)}|{pub_date.isoformat()}|{pk}"
+        encoded = b64encode(raw.encode("ascii")).decode("ascii")
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = b64decode(encoded.encode("ascii")).decode("ascii")
+            reverse, pub_date, pk = raw.split("|")
+            pub_date = parse_datetime(pub_date)
+            if pub_date is None:
+                raise ValueError
+            return bool(int(reverse)), pub_date, int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class ReviewCommentPagination(PageNumberPagination):
+    """
+    Постраничная пагинация отзывов и комментариев.
+    С параметром ?pagination=cursor (или при наличии ?cursor=)
+    переключается на keyset-пагинацию без COUNT(*) и OFFSET.
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
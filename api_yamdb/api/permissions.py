@@ -9,7 +9,7 @@ class AuthorOrAdminOrModeratOrReadOnly(BasePermission):
             request.method in SAFE_METHODS
             or request.user.is_admin
             or request.user.is_moderator
-            or obj.author == request.user
+            or obj.author_id == request.user.pk
         )
 
 
@@ -0,0 +1,149 @@
+from rest_framework import serializers
+
+from reviews import catalog
+from reviews.models import Comment, Title
+
+# Тот же формат даты, что и у DateTimeField сериализаторов.
+datetime_field = serializers.DateTimeField()
+
+
+def catalog_item(obj):
+    return None if obj is None else {"name": obj.name, "slug": obj.slug}
+
+
+class ValuesReader:
+    """
+    Собирает ответ списка из строк values() без создания моделей.
+    fields — поля ответа в порядке сериализатора и колонки, нужные
+    каждому из них; key_columns читаются всегда (id, ключ пагинации).
+    Поле с методом read_<имя> собирается им, иначе берётся колонка.
+    """
+
+    fields = {}
+    key_columns = ("id",)
+
+    def select(self, fields=None):
+        """Поля ответа из fields (все, если None) в порядке self.fields."""
+        if fields is None:
+            return list(self.fields)
+        return [name for name in self.fields if name in fields]
+
+    def columns(self, fields):
+        columns = dict.fromkeys(self.key_columns)
+        for name in fields:
+            columns.update(dict.fromkeys(self.fields.get(name, ())))
+        return list(columns)
+
+    def values(self, queryset, fields):
+        return queryset.prefetch_related(None).values(*self.columns(fields))
+
+    def prepare(self, rows, fields):
+        """Данные для всей страницы разом (жанры, комментарии)."""
+        return None
+
+    def build(self, rows, fields):
+        context = self.prepare(rows, fields)
+        readers = [
+            (name, getattr(self, f"read_{name}", None), self.fields[name])
+            for name in fields
+        ]
+        return [
+            {
+                name: (
+                    read(row, context) if read is not None else row[columns[0]]
+                )
+                for name, read, columns in readers
+            }
+            for row in rows
+        ]
+
+
+class TitleReader(ValuesReader):
+    fields = {
+        "id": ("id",),
+        "name": ("name",),
+        "year": ("year",),
+        "rating": ("rating_sum", "rating_count"),
+        "description": ("description",),
+        "genre": (),
+        "category": ("category_id",),
+    }
+
+    def prepare(self, rows, fields):
+        if "genre" not in fields:
+            return None
+        genres = {row["id"]: [] for row in rows}
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=genres
+        ).values_list("title_id", "genre_id"):
+            genre = catalog.genres.get_by_id(genre_id)
+            if genre is not None:
+                genres[title_id].append(genre)
+        return genres
+
+    def read_rating(self, row, context):
+        if not row["rating_count"]:
+            return None
+        return row["rating_sum"] // row["rating_count"]
+
+    def read_genre(self, row, genres):
+        return [
+            catalog_item(genre)
+            for genre in sorted(
+                genres[row["id"]], key=lambda genre: genre.name
+            )
+        ]
+
+    def read_category(self, row, context):
+        return catalog_item(catalog.categories.get_by_id(row["category_id"]))
+
+
+class CommentReader(ValuesReader):
+    fields = {
+        "id": ("id",),
+        "author": ("author__username",),
+        "text": ("text",),
+        "pub_date": ("pub_date",),
+    }
+    key_columns = ("id", "pub_date")
+
+    def read_pub_date(self, row, context):
+        return datetime_field.to_representation(row["pub_date"])
+
+
+class ReviewReader(ValuesReader):
+    fields = {
+        "id": ("id",),
+        "text": ("text",),
+        "pub_date": ("pub_date",),
+        "author": ("author__username",),
+        "title": ("title_id",),
+        "score": ("score",),
+        "comments": (),
+    }
+    key_columns = ("id", "pub_date")
+    comments = CommentReader()
+
+    def prepare(self, rows, fields):
+        if "comments" not in fields:
+            return None
+        comment_fields = self.comments.select()
+        comments = {row["id"]: [] for row in rows}
+        queryset = Comment.objects.filter(review_id__in=comments).order_by(
+            "pk"
+        )
+        comment_rows = list(
+            queryset.values(
+                "review_id", *self.comments.columns(comment_fields)
+            )
+        )
+        for row, comment in zip(
+            comment_rows, self.comments.build(comment_rows, comment_fields)
+        ):
+            comments[row["review_id"]].append(comment)
+        return comments
+
+    read_pub_date = CommentReader.read_pub_date
+
+    def read_comments(self, row, comments):
+        return comments[row["id"]]
@@ -0,0 +1,30 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson, если он установлен. Типы, которые orjson
+    не знает (Decimal, ленивые строки перевода и т. п.), кодируются
+    тем же JSONEncoder, что и в DRF. Без orjson, а также при запросе
+    отступов, работает обычный JSONRenderer.
+    """
+
+    options = 0 if orjson is None else orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(
+            data,
+            default=encoders.JSONEncoder().default,
+            option=self.options,
+        )
@@ -1,13 +1,267 @@
 import datetime as dt
+from operator import attrgetter
 
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Q
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
 
+from core import versions
+from reviews import catalog
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
+from users.validators import CustomUsernameValidator
+
+SPARSE_FIELDS_PARAM = "fields"
+SPARSE_OMIT_PARAM = "omit"
+USERNAME_TAKEN = User._meta.get_field("username").error_messages["unique"]
+EMAIL_TAKEN = "Пользователь с таким адресом электронной почты уже существует."
+
+
+def get_sparse_fields(request, available):
+    """
+    Поля ответа по ?fields=a,b и ?omit=c в порядке available или None,
+    если параметры не переданы. Учитывается только в GET-запросах.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = request.query_params
+    if SPARSE_FIELDS_PARAM not in params and SPARSE_OMIT_PARAM not in params:
+        return None
+
+    def parse(param):
+        names = {
+            name.strip()
+            for name in params.get(param, "").split(",")
+            if name.strip()
+        }
+        unknown = names.difference(available)
+        if unknown:
+            raise serializers.ValidationError(
+                {param: [f"Неизвестные поля: {', '.join(sorted(unknown))}."]}
+            )
+        return names
+
+    selected = (
+        parse(SPARSE_FIELDS_PARAM)
+        if SPARSE_FIELDS_PARAM in params
+        else set(available)
+    )
+    omitted = parse(SPARSE_OMIT_PARAM)
+    return [name for name in available if name in selected - omitted]
+
+
+class SparseFieldsMixin:
+    """
+    Оставляет в ответе корневого сериализатора только поля
+    из ?fields= и без полей из ?omit=. Вложенные сериализаторы
+    отдаются целиком.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        root = self
+        if isinstance(self.parent, serializers.ListSerializer):
+            root = self.parent
+        if root.parent is not None:
+            return fields
+        sparse = get_sparse_fields(self.context.get("request"), list(fields))
+        if sparse is None:
+            return fields
+        return type(fields)((name, fields[name]) for name in sparse)
+
+
+# Поля, у которых to_representation возвращает значение модели как есть.
+PLAIN_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.SlugField,
+    serializers.EmailField,
+    serializers.ReadOnlyField,
+)
+
+
+class CompiledRepresentationMixin:
+    """
+    Быстрый to_representation для ModelSerializer: поля один раз
+    превращаются в список (имя, чтение атрибута, преобразование),
+    и строка собирается в dict одним проходом без get_attribute
+    и OrderedDict. План хранится на классе по набору полей, поэтому
+    новые экземпляры (в том числе вложенные) его не пересобирают.
+    Сложные поля (вложенные сериализаторы, вычисляемые методы)
+    по-прежнему читаются через DRF.
+    """
+
+    compiled_representation = True
+
+    def to_representation(self, instance):
+        if not self.compiled_representation:
+            return super().to_representation(instance)
+        plan = self.__dict__.get("_representation_plan")
+        if plan is None:
+            plan = self._representation_plan = self.bind_representation()
+        row = {}
+        try:
+            for name, getter, convert in plan:
+                value = getter(instance)
+                if value is not None and convert is not None:
+                    value = convert(value)
+                row[name] = value
+        except (AttributeError, KeyError, SkipField):
+            # Отсутствующий атрибут DRF обрабатывает по-своему
+            # (default, пропуск поля): отдаём строку ему.
+            return super().to_representation(instance)
+        return row
+
+    @classmethod
+    def representation_plans(cls):
+        # Свой словарь у каждого класса: у подклассов другие поля.
+        plans = cls.__dict__.get("_representation_plans")
+        if plans is None:
+            plans = {}
+            cls._representation_plans = plans
+        return plans
+
+    def bind_representation(self):
+        """
+        План для этого экземпляра: разбор полей берётся из кэша класса
+        по набору полей, вместо имён методов подставляются свои поля.
+        """
+        fields = list(self._readable_fields)
+        key = tuple(
+            (
+                field.field_name,
+                type(field),
+                tuple(field.source_attrs),
+                getattr(field, "slug_field", None),
+            )
+            for field in fields
+        )
+        plans = self.representation_plans()
+        compiled = plans.get(key)
+        if compiled is None:
+            model = self.Meta.model
+            compiled = plans[key] = [
+                self.compile_field(model, field) for field in fields
+            ]
+        return [
+            (
+                field.field_name,
+                *(
+                    getattr(field, step) if isinstance(step, str) else step
+                    for step in steps
+                ),
+            )
+            for field, steps in zip(fields, compiled)
+        ]
+
+    @staticmethod
+    def compile_field(model, field):
+        """
+        Возвращает (getter, convert) для поля сериализатора; строка —
+        имя метода поля, которое подставит bind_representation.
+        """
+        generic = ("get_attribute", "to_representation")
+        attrs = field.source_attrs
+        if len(attrs) != 1 or callable(getattr(model, attrs[0], None)):
+            return generic
+        if type(field) in PLAIN_FIELDS:
+            return attrgetter(attrs[0]), None
+        if type(field) is serializers.DateTimeField:
+            return attrgetter(attrs[0]), "to_representation"
+        if type(field) is serializers.SlugRelatedField:
+            try:
+                related = model._meta.get_field(attrs[0])
+            except FieldDoesNotExist:
+                return generic
+            if field.slug_field == related.target_field.attname:
+                return attrgetter(related.attname), None
+            return attrgetter(attrs[0]), attrgetter(field.slug_field)
+        return generic
+
+
+class CatalogSlugListField(ManyRelatedField):
+    """
+    Список slug справочника: все slug разрешаются разом через кэш
+    (промахи — одним запросом IN), об отсутствующих сообщается сразу.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+        child = self.child_relation
+        slugs = list(dict.fromkeys(data))
+        if not all(isinstance(slug, str) for slug in slugs):
+            child.fail("invalid")
+        found = child.catalog_cache.get_many(slugs)
+        unknown = [slug for slug in slugs if slug not in found]
+        if unknown:
+            raise serializers.ValidationError(
+                [
+                    child.error_messages["does_not_exist"].format(
+                        slug_name=child.slug_field, value=smart_str(slug)
+                    )
+                    for slug in unknown
+                ]
+            )
+        return [found[slug] for slug in slugs]
+
+
+class CatalogSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объекты в кэше справочника."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return CatalogSlugListField(**list_kwargs)
+
+    def __init__(self, catalog_cache, **kwargs):
+        self.catalog_cache = catalog_cache
+        kwargs.setdefault("queryset", catalog_cache.model.objects.all())
+        super().__init__(slug_field="slug", **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("invalid")
+        obj = self.catalog_cache.get(data)
+        if obj is None:
+            self.fail(
+                "does_not_exist",
+                slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+        return obj
+
+
+class CatalogObjectField(serializers.ReadOnlyField):
+    """Вложенный объект справочника по id из кэша, без JOIN в запросе."""
 
+    def __init__(self, catalog_cache, serializer_class, **kwargs):
+        self.catalog_cache = catalog_cache
+        # Один сериализатор на поле, а не новый на каждую строку.
+        self.serializer = serializer_class()
+        super().__init__(**kwargs)
 
-class CategorySerializer(serializers.ModelSerializer):
+    def to_representation(self, pk):
+        obj = self.catalog_cache.get_by_id(pk)
+        if obj is None:
+            return None
+        return self.serializer.to_representation(obj)
+
+
+class CategorySerializer(
+    CompiledRepresentationMixin, serializers.ModelSerializer
+):
     """Cериалайзер для категорий."""
 
     class Meta:
@@ -16,7 +270,9 @@ class CategorySerializer(serializers.ModelSerializer):
         lookup_field = "slug"
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(
+    CompiledRepresentationMixin, serializers.ModelSerializer
+):
     """Cериалайзер для жанров."""
 
     class Meta:
@@ -29,12 +285,8 @@ class TitleSerializer(serializers.ModelSerializer):
     """Cериалайзер для произведений."""
 
     year = serializers.IntegerField()
-    category = serializers.SlugRelatedField(
-        slug_field="slug", queryset=Category.objects.all(), many=False
-    )
-    genre = serializers.SlugRelatedField(
-        slug_field="slug", many=True, queryset=Genre.objects.all()
-    )
+    category = CatalogSlugRelatedField(catalog_cache=catalog.categories)
+    genre = CatalogSlugRelatedField(catalog_cache=catalog.genres, many=True)
 
     class Meta:
         model = Title
@@ -58,14 +310,59 @@ class TitleSerializer(serializers.ModelSerializer):
         serializer = TitleOnlyReadSerializer(title)
         return serializer.data
 
+    @transaction.atomic
+    def create(self, validated_data):
+        genres = validated_data.pop("genre", [])
+        title = super().create(validated_data)
+        self.set_genres(title, genres)
+        return title
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        genres = validated_data.pop("genre", None)
+        instance = super().update(instance, validated_data)
+        if genres is not None:
+            self.set_genres(instance, genres)
+        return instance
+
+    def set_genres(self, title, genres):
+        """Сверяет жанры с текущими и применяет разницу двумя запросами."""
+        through = Title.genre.through
+        current = set(
+            through.objects.filter(title=title).values_list(
+                "genre_id", flat=True
+            )
+        )
+        wanted = {genre.pk for genre in genres}
+        removed = current - wanted
+        added = wanted - current
+        if removed:
+            through.objects.filter(title=title, genre_id__in=removed).delete()
+        if added:
+            through.objects.bulk_create(
+                [through(title=title, genre_id=pk) for pk in added]
+            )
+        if removed or added:
+            versions.bump(versions.TITLES)
+        if hasattr(title, "_prefetched_objects_cache"):
+            title._prefetched_objects_cache.pop("genre", None)
+
 
-class TitleOnlyReadSerializer(serializers.ModelSerializer):
+class TitleOnlyReadSerializer(
+    SparseFieldsMixin,
+    CompiledRepresentationMixin,
+    serializers.ModelSerializer,
+):
     """Cериалайзер для получения списка произведений."""
 
     rating = serializers.IntegerField(
         read_only=True,
     )
-    category = CategorySerializer(read_only=True)
+    category = CatalogObjectField(
+        catalog_cache=catalog.categories,
+        serializer_class=CategorySerializer,
+        source="category_id",
+    )
     genre = GenreSerializer(many=True, read_only=True)
 
     class Meta:
@@ -90,7 +387,11 @@ class TitleOnlyReadSerializer(serializers.ModelSerializer):
         )
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    SparseFieldsMixin,
+    CompiledRepresentationMixin,
+    serializers.ModelSerializer,
+):
     """Сериализатор модели комментария к ревью."""
 
     author = serializers.SlugRelatedField(
@@ -109,7 +410,11 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ("review",)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsMixin,
+    CompiledRepresentationMixin,
+    serializers.ModelSerializer,
+):
     """Сериализатор модели ревью на произведение."""
 
     title = serializers.SlugRelatedField(
@@ -146,7 +451,7 @@ class ReviewSerializer(serializers.ModelSerializer):
             return data
         author = self.context.get("request").user
         title_id = self.context.get("view").kwargs.get("title_id")
-        if Review.objects.filter(author=author, title=title_id).exists():
+        if Review.objects.filter(author_id=author.pk, title=title_id).exists():
             raise serializers.ValidationError(
                 "Нельзя оставлять повторный отзыв."
             )
@@ -158,7 +463,19 @@ class ReviewSerializer(serializers.ModelSerializer):
         return score
 
 
-class UserSerializer(serializers.ModelSerializer):
+class ReviewPreviewSerializer(ReviewSerializer):
+    """Сериализатор ревью с числом комментариев и последними из них."""
+
+    comments_count = serializers.IntegerField(read_only=True)
+    comments = CommentSerializer(
+        source="latest_comments", many=True, read_only=True
+    )
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ("comments_count",)
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Cериалайзер для юзеров."""
 
     class Meta:
@@ -180,12 +497,18 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
 
-class SignUpSerializer(serializers.ModelSerializer):
-    """Cериалайзер для регистрации новых юзеров."""
+class SignUpSerializer(serializers.Serializer):
+    """
+    Cериалайзер для регистрации новых юзеров. Пользователь с таким
+    username или email ищется одним запросом по обоим уникальным
+    индексам: совпадение обоих полей — повторная регистрация,
+    совпадение одного — ошибка, иначе создаётся новый пользователь.
+    """
 
-    class Meta:
-        model = User
-        fields = ("email", "username")
+    email = serializers.EmailField(max_length=254)
+    username = serializers.CharField(
+        max_length=150, validators=[CustomUsernameValidator()]
+    )
 
     def validate_username(self, value):
         if value == "me":
@@ -194,6 +517,32 @@ class SignUpSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def validate(self, attrs):
+        username, email = attrs["username"], attrs["email"]
+        errors = {}
+        for user in (
+            User.objects.filter(Q(username=username) | Q(email=email))
+            .order_by()
+            .only("username", "email", "confirmation_code")[:2]
+        ):
+            if user.username == username and user.email == email:
+                return {**attrs, "user": user}
+            if user.username == username:
+                errors["username"] = [USERNAME_TAKEN]
+            if user.email == email:
+                errors["email"] = [EMAIL_TAKEN]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        user = validated_data.get("user")
+        if user is not None:
+            return user
+        return User.objects.create(
+            username=validated_data["username"], email=validated_data["email"]
+        )
+
 
 class UserMeSerializer(UserSerializer):
     """Cериалайзер для получения информации о юзере."""
@@ -6,4 +6,5 @@ def make_confirmation_code():
 
 
 def check_confirmation_code(user, confirmation_code) -> bool:
-    return user.confirmation_code == confirmation_code
+    # Код приходит строкой, а в модели хранится UUID.
+    return str(user.confirmation_code) == str(confirmation_code)
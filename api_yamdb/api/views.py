@@ -1,19 +1,30 @@
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import (
     IsAuthenticated,
     IsAuthenticatedOrReadOnly,
 )
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.mixins import CreateUpdateDeleteViewSet
+from api.mixins import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    CreateUpdateDeleteViewSet,
+    ReplicaReadMixin,
+    SparseQueryMixin,
+    ValuesListMixin,
+)
 from api.permissions import (
     AuthorOrAdminOrModeratOrReadOnly,
     IsAdminOrReadOnly,
@@ -24,6 +35,7 @@ from api.serializers import (
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
+    ReviewPreviewSerializer,
     ReviewSerializer,
     SignUpSerializer,
     TitleOnlyReadSerializer,
@@ -32,13 +44,34 @@ from api.serializers import (
     UserMeSerializer,
     UserSerializer,
 )
-from reviews.models import Category, Genre, Review, Title
+from core import outbox, versions
+from core.exporter import EXPORT_FORMATS, export_titles
+from reviews import catalog
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleRanking,
+)
+from reviews.ratings import rating_stats
+from users import tokens
 from users.models import User
 
+from .bulk import TitleBulkUpsert
 from .filters import TitleFilter
+from .pagination import ReviewCommentPagination
+from .parsers import NDJSONParser
+from .readers import CommentReader, ReviewReader, TitleReader
 from .utils import check_confirmation_code
 
 ALLOWED_METHODS = ("get", "post", "patch", "delete")
+EXPORT_FORMAT_PARAM = "output"
+TOP_LIMIT_PARAM = "limit"
+COMMENTS_LIMIT_PARAM = "comments_limit"
+MAX_COMMENTS_LIMIT = 20
+SIGNUP_CONFLICT = "Пользователь с таким username или email уже существует."
 
 
 class ListCreateDestroyViewSet(
@@ -103,14 +136,19 @@ class GenreViewSet(CreateUpdateDeleteViewSet):
         return Response(serializer.data, status=status.HTTP_204_NO_CONTENT)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     """Вьюсет модели произведений."""
 
-    queryset = (
-        Title.objects.annotate(rating=Avg("reviews__score"))
-        .select_related("category")
-        .prefetch_related("genre")
-    )
+    cache_namespace = "titles"
+    values_reader = TitleReader()
+    lookup_value_regex = r"\d+"
+    queryset = Title.objects.prefetch_related("genre")
     permission_classes = [IsAdminOrReadOnly]
     filterset_class = TitleFilter
     filter_backends = [DjangoFilterBackend]
@@ -120,21 +158,232 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleOnlyReadSerializer
         return TitleSerializer
 
+    def get_version_keys(self):
+        return [versions.TITLES]
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.wants_field("genre"):
+            queryset = queryset.prefetch_related(None)
+        return self.sparse_queryset(queryset)
+
+    @action(detail=True, methods=["get"])
+    def rating(self, request, pk=None):
+        """Гистограмма оценок 1–10, средняя оценка и число отзывов."""
+        stats = rating_stats(pk)
+        if stats is None:
+            raise Http404
+        return Response(stats)
+
+    def get_top_scope(self):
+        """(разрез, id разреза) топа по ?category= или ?genre=."""
+        params = self.request.query_params
+        scopes = [
+            (scope, cache, params[name])
+            for name, scope, cache in (
+                ("category", TitleRanking.CATEGORY, catalog.categories),
+                ("genre", TitleRanking.GENRE, catalog.genres),
+            )
+            if params.get(name)
+        ]
+        if not scopes:
+            return TitleRanking.ALL, 0
+        if len(scopes) > 1:
+            raise ValidationError(
+                {"non_field_errors": ["Укажите либо category, либо genre."]}
+            )
+        scope, cache, slug = scopes[0]
+        item = cache.get(slug)
+        if item is None:
+            raise Http404
+        return scope, item.pk
+
+    def get_top_limit(self):
+        value = self.request.query_params.get(TOP_LIMIT_PARAM)
+        if value is None:
+            return settings.TOP_TITLES_SIZE
+        try:
+            limit = int(value)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            raise ValidationError(
+                {TOP_LIMIT_PARAM: ["Укажите положительное число."]}
+            )
+        return min(limit, settings.TOP_TITLES_SIZE)
+
+    @action(detail=False, methods=["get"])
+    def top(self, request):
+        """
+        Топ произведений по байесовской оценке из таблицы рейтингов
+        (общий, ?category= или ?genre=), в порядке мест.
+        """
+        scope, scope_id = self.get_top_scope()
+        rankings = list(
+            TitleRanking.objects.filter(scope=scope, scope_id=scope_id)
+            .order_by("position")
+            .values_list("title_id", "score")[: self.get_top_limit()]
+        )
+        reader = self.values_reader
+        fields = reader.select(self.get_sparse_fields())
+        titles = {
+            row["id"]: row
+            for row in reader.values(
+                Title.objects.filter(pk__in=[pk for pk, _ in rankings]),
+                fields,
+            )
+        }
+        rows = [titles[pk] for pk, _ in rankings if pk in titles]
+        scores = dict(rankings)
+        data = reader.build(rows, fields)
+        for item, row in zip(data, rows):
+            item["score"] = round(scores[row["id"]], 2)
+        return Response(data)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        parser_classes=(JSONParser, NDJSONParser),
+    )
+    def bulk(self, request):
+        """
+        Массовое создание и обновление произведений: JSON-массив
+        или NDJSON. Элементы с существующим id обновляются.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {"non_field_errors": ["Ожидается массив произведений."]}
+            )
+        results = TitleBulkUpsert().run(request.data)
+        summary = {"created": 0, "updated": 0, "error": 0}
+        for result in results:
+            summary[result["status"]] += 1
+        return Response({**summary, "results": results})
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=(IsAuthenticated, IsAdminRole),
+    )
+    def export(self, request):
+        """
+        Потоковая выгрузка всех произведений (с учётом фильтров)
+        в CSV или NDJSON: ?output=csv|ndjson.
+        """
+        output_format = request.query_params.get(EXPORT_FORMAT_PARAM, "csv")
+        if output_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {
+                    EXPORT_FORMAT_PARAM: [
+                        f"Доступно: {', '.join(EXPORT_FORMATS)}."
+                    ]
+                }
+            )
+        content_type, extension, _ = EXPORT_FORMATS[output_format]
+        queryset = self.filter_queryset(Title.objects.all())
+        response = StreamingHttpResponse(
+            export_titles(output_format, queryset), content_type=content_type
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="titles.{extension}"'
+        return response
+
+
+class ReviewViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     """Вьюсет модели ревью на произведение."""
 
-    pagination_class = PageNumberPagination
+    values_reader = ReviewReader()
+    pagination_class = ReviewCommentPagination
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         AuthorOrAdminOrModeratOrReadOnly,
     )
     serializer_class = ReviewSerializer
 
+    def get_version_keys(self):
+        return [versions.reviews_key(self.kwargs["title_id"]), versions.USERS]
+
+    def get_comments_limit(self):
+        """
+        Лимит встроенных комментариев из ?comments_limit=N
+        или None, если параметр не передан.
+        """
+        if self.request.method != "GET":
+            return None
+        value = self.request.query_params.get(COMMENTS_LIMIT_PARAM)
+        if value is None:
+            return None
+        try:
+            limit = int(value)
+            if limit < 0:
+                raise ValueError
+        except ValueError:
+            raise ValidationError(
+                {COMMENTS_LIMIT_PARAM: ["Укажите неотрицательное число."]}
+            )
+        return min(limit, MAX_COMMENTS_LIMIT)
+
+    def use_values_reader(self):
+        # Превью комментариев собирается сериализатором.
+        return (
+            super().use_values_reader() and self.get_comments_limit() is None
+        )
+
+    def get_serializer_class(self):
+        if self.get_comments_limit() is not None:
+            return ReviewPreviewSerializer
+        return ReviewSerializer
+
     def get_queryset(self):
         title_id = self.kwargs.get("title_id")
         title = get_object_or_404(Title, id=title_id)
-        return title.reviews.select_related("author")
+        queryset = title.reviews.all()
+        if self.wants_field("author"):
+            queryset = queryset.select_related("author")
+        queryset = self.sparse_queryset(queryset)
+        limit = self.get_comments_limit()
+        if not self.wants_field("comments"):
+            comments = None
+        elif limit is None:
+            comments = Prefetch(
+                "comments",
+                queryset=Comment.objects.select_related("author"),
+            )
+        else:
+            latest_ids = (
+                Comment.objects.filter(review=OuterRef("review"))
+                .order_by("-pub_date", "-id")
+                .values("id")[:limit]
+            )
+            comments = Prefetch(
+                "comments",
+                queryset=Comment.objects.filter(id__in=Subquery(latest_ids))
+                .select_related("author")
+                .order_by("-pub_date", "-id"),
+                to_attr="latest_comments",
+            )
+        if limit is not None and self.wants_field("comments_count"):
+            comments_count = (
+                Comment.objects.filter(review=OuterRef("pk"))
+                .order_by()
+                .values("review")
+                .annotate(total=Count("pk"))
+                .values("total")
+            )
+            queryset = queryset.annotate(
+                comments_count=Coalesce(
+                    Subquery(comments_count, output_field=IntegerField()), 0
+                )
+            )
+        if comments is None:
+            return queryset
+        return queryset.prefetch_related(comments)
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get("title_id")
@@ -142,28 +391,51 @@ class ReviewViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, title=title)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     """Вьюсет модели комментария к ревью на произведение."""
 
     permission_classes = (
         IsAuthenticatedOrCreateOnly,
         AuthorOrAdminOrModeratOrReadOnly,
     )
-    pagination_class = PageNumberPagination
+    pagination_class = ReviewCommentPagination
     serializer_class = CommentSerializer
+    values_reader = CommentReader()
+
+    def get_version_keys(self):
+        return [
+            versions.comments_key(self.kwargs["review_id"]),
+            versions.USERS,
+        ]
 
     def get_review(self):
         review_id = self.kwargs.get("review_id")
         return get_object_or_404(Review, id=review_id)
 
     def get_queryset(self):
-        return self.get_review().comments.select_related("author")
+        queryset = self.get_review().comments.all()
+        if self.wants_field("author"):
+            queryset = queryset.select_related("author")
+        return self.sparse_queryset(queryset)
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
 
+    def perform_destroy(self, instance):
+        keys = (
+            versions.comments_key(instance.review_id),
+            versions.reviews_key(instance.review.title_id),
+        )
+        super().perform_destroy(instance)
+        versions.bump(*keys)
+
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseQueryMixin, viewsets.ModelViewSet):
     """Вьюсет модели юзера."""
 
     queryset = User.objects.all()
@@ -182,6 +454,9 @@ class UserViewSet(viewsets.ModelViewSet):
     pagination_class = PageNumberPagination
     http_method_names = ALLOWED_METHODS
 
+    def get_queryset(self):
+        return self.sparse_queryset(super().get_queryset())
+
     @action(
         methods=["GET", "PATCH"],
         detail=False,
@@ -213,26 +488,22 @@ class SignUpViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
 
     def create(self, request):
         serializer = SignUpSerializer(data=request.data)
-        if User.objects.filter(
-            username=request.data.get("username"),
-            email=request.data.get("email"),
-        ):
-            user = User.objects.get(username=request.data.get("username"))
-            serializer = SignUpSerializer(user, data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            username = request.data.get("username")
-            user = User.objects.get(username=username)
-            code = user.confirmation_code
-            send_mail(
-                f"Добро пожаловать в YaMDb, {user.username}!",
-                (f"Ваш confirmation_code: {code} "),
-                None,
-                [request.data.get("email")],
-                fail_silently=False,
-            )
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer.is_valid(raise_exception=True)
+        # Письмо ставится в очередь в той же транзакции, отправляет
+        # его команда send_outbox.
+        try:
+            with transaction.atomic():
+                user = serializer.save()
+                outbox.enqueue(
+                    f"Добро пожаловать в YaMDb, {user.username}!",
+                    f"Ваш confirmation_code: {user.confirmation_code} ",
+                    [user.email],
+                )
+        except IntegrityError:
+            # Такого же пользователя только что зарегистрировал
+            # параллельный запрос.
+            raise ValidationError({"non_field_errors": [SIGNUP_CONFLICT]})
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class Token(APIView):
@@ -246,8 +517,8 @@ class Token(APIView):
         confirmation_code = serializer.validated_data.get("confirmation_code")
         username = serializer.validated_data.get("username")
         user = get_object_or_404(User, username=username)
-        if check_confirmation_code(user, confirmation_code):
-            token = AccessToken.for_user(user)
+        if user.is_active and check_confirmation_code(user, confirmation_code):
+            token = tokens.access_token_for(user)
             return Response({"token": f"{token}"}, status=status.HTTP_200_OK)
         return Response(
             {"confirmation_code": ["Код не действителен!"]},
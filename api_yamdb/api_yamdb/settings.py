@@ -36,6 +36,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.QueryCountMiddleware",
+    "core.middleware.PrimaryStickyMiddleware",
 ]
 
 ROOT_URLCONF = "api_yamdb.urls"
@@ -47,11 +49,15 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend"
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 SIMPLE_JWT = {
@@ -59,6 +65,12 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Сколько секунд кэшируется версия токенов пользователя
+# (api.authentication.ClaimsJWTAuthentication). С общим кэшем смена роли
+# отзывает токены сразу, с LocMemCache другие процессы узнают о ней
+# не позже чем через это время.
+TOKEN_VERSION_CACHE_TIMEOUT = int(os.getenv("TOKEN_VERSION_CACHE_TIMEOUT", 60))
+
 TEMPLATES_DIR = BASE_DIR / "templates"
 TEMPLATES = [
     {
@@ -79,11 +91,61 @@ TEMPLATES = [
 WSGI_APPLICATION = "api_yamdb.wsgi.application"
 
 
+# База данных задаётся окружением: по умолчанию файл SQLite рядом
+# с manage.py, для PostgreSQL — DB_ENGINE=django.db.backends.postgresql
+# и параметры подключения DB_NAME, POSTGRES_USER, POSTGRES_PASSWORD,
+# DB_HOST, DB_PORT.
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": os.getenv("DB_ENGINE", "django.db.backends.sqlite3"),
+        "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
+        "USER": os.getenv("POSTGRES_USER", ""),
+        "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+        "HOST": os.getenv("DB_HOST", ""),
+        "PORT": os.getenv("DB_PORT", ""),
+        # Сколько секунд держать соединение между запросами
+        # (0 — закрывать после каждого запроса).
+        "CONN_MAX_AGE": int(os.getenv("CONN_MAX_AGE", 0)),
+        # Проверять постоянное соединение перед запросом и открывать
+        # новое, если БД его разорвала (core.connections).
+        "CONN_HEALTH_CHECKS": os.getenv("CONN_HEALTH_CHECKS", "1") == "1",
+    }
+}
+
+# Реплики только для чтения: DB_REPLICAS — список через запятую
+# (для SQLite — пути к файлам, для остальных баз — хосты с теми же
+# параметрами подключения, что у default). GET-запросы к произведениям,
+# отзывам и комментариям читают со случайной реплики (core.routers),
+# кроме клиентов, писавших в последние DB_PRIMARY_STICKY_SECONDS.
+REPLICA_DATABASES = []
+REPLICA_LOCATION_KEY = (
+    "NAME" if DATABASES["default"]["ENGINE"].endswith("sqlite3") else "HOST"
+)
+for number, location in enumerate(
+    filter(None, os.getenv("DB_REPLICAS", "").split(",")), start=1
+):
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        REPLICA_LOCATION_KEY: location.strip(),
+        "TEST": {"MIRROR": "default"},
     }
+    REPLICA_DATABASES.append(f"replica_{number}")
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+DB_PRIMARY_STICKY_SECONDS = int(os.getenv("DB_PRIMARY_STICKY_SECONDS", 5))
+
+# PRAGMA, которые core.signals выполняет на каждом новом соединении
+# с SQLite. WAL позволяет читать во время записи, synchronous=NORMAL
+# в режиме WAL не теряет целостность при сбое процесса, busy_timeout
+# (мс) заставляет ждать блокировку вместо ошибки «database is locked»,
+# cache_size < 0 — размер кэша страниц в КиБ. Пустое значение
+# переменной окружения оставляет настройку SQLite по умолчанию.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "normal"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", "5000"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "memory"),
 }
 
 
@@ -135,4 +197,59 @@ EMAIL_USE_TLS = True
 
 EMAIL_USE_SSL = False
 
+# Очередь исходящих писем (core.outbox, команда send_outbox):
+# размер пачки, число попыток, пауза перед повтором (секунды,
+# удваивается после каждой ошибки до EMAIL_OUTBOX_MAX_BACKOFF)
+# и время, на которое обработчик захватывает письма.
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 100))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_BACKOFF = int(os.getenv("EMAIL_OUTBOX_BACKOFF", 30))
+EMAIL_OUTBOX_MAX_BACKOFF = int(os.getenv("EMAIL_OUTBOX_MAX_BACKOFF", 3600))
+EMAIL_OUTBOX_LEASE = int(os.getenv("EMAIL_OUTBOX_LEASE", 300))
+
 AUTH_USER_MODEL = "users.User"
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "api_yamdb"),
+    }
+}
+
+# Кэш страниц списка произведений (api.mixins.CachedListMixin).
+# LocMemCache у каждого процесса свой; версия коллекции в ключе
+# берётся из БД, поэтому страницы не устаревают и при нескольких
+# процессах.
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300))
+
+# Как часто процесс сверяет кэш категорий и жанров (reviews.catalog)
+# с версией в БД, секунды.
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", 1))
+
+# Материализованный рейтинг /api/v1/titles/top/ (refresh_rankings):
+# сколько произведений хранить в каждом разрезе и вес априорной средней
+# в байесовской оценке (0 — обычная средняя оценка).
+TOP_TITLES_SIZE = int(os.getenv("TOP_TITLES_SIZE", 100))
+TOP_TITLES_PRIOR = float(os.getenv("TOP_TITLES_PRIOR", 10))
+
+# Инструментирование SQL-запросов (core.middleware.QueryCountMiddleware).
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 200))
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 5))
+DB_SLOWEST_QUERIES = int(os.getenv("DB_SLOWEST_QUERIES", 3))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.db": {
+            "handlers": ["console"],
+            "level": os.getenv("DB_LOG_LEVEL", "WARNING"),
+        },
+    },
+}
@@ -0,0 +1,23 @@
+import django
+from django.db import connections
+
+# Начиная с Django 4.1 постоянные соединения проверяет сам фреймворк
+# по тому же ключу CONN_HEALTH_CHECKS.
+NATIVE_HEALTH_CHECKS = django.VERSION >= (4, 1)
+
+
+def close_unusable_connections():
+    """
+    Закрывает открытые соединения с CONN_HEALTH_CHECKS, которые БД уже
+    разорвала (перезапуск, таймаут простоя): запрос откроет новое
+    соединение вместо ошибки на первом SQL.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is None
+            or connection.in_atomic_block
+            or not connection.settings_dict.get("CONN_HEALTH_CHECKS")
+        ):
+            continue
+        if not connection.is_usable():
+            connection.close()
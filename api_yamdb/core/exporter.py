@@ -0,0 +1,115 @@
+import csv
+import json
+
+from reviews import catalog
+from reviews.models import Title
+
+from .loader import chunked
+
+# Выгрузку читает filling_db как titles.csv: category_id и жанры
+# (slug через пробел) загружаются, категория slug-ом и рейтинг
+# вычисляются заново (core.loader.DERIVED_COLUMNS).
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "year",
+    "description",
+    "category_id",
+    "category",
+    "genre",
+    "rating",
+    "rating_count",
+)
+TITLE_COLUMNS = (
+    "id",
+    "name",
+    "year",
+    "description",
+    "category_id",
+    "rating_sum",
+    "rating_count",
+)
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def iter_titles(queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Итератор словарей EXPORT_FIELDS по всем произведениям queryset.
+    Строки читаются курсором пачками по chunk_size, жанры пачки —
+    одним запросом, slug берутся из кэша справочников.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    rows = (
+        queryset.order_by("pk")
+        .values_list(*TITLE_COLUMNS)
+        .iterator(chunk_size=chunk_size)
+    )
+    through = Title.genre.through.objects.using(queryset.db)
+    for chunk in chunked(rows, chunk_size):
+        genres = {}
+        for title_id, genre_id in (
+            through.filter(title_id__in=[row[0] for row in chunk])
+            .order_by("title_id", "genre_id")
+            .values_list("title_id", "genre_id")
+        ):
+            genre = catalog.genres.get_by_id(genre_id)
+            if genre is not None:
+                genres.setdefault(title_id, []).append(genre.slug)
+        for pk, name, year, description, category_id, total, count in chunk:
+            category = catalog.categories.get_by_id(category_id)
+            yield {
+                "id": pk,
+                "name": name,
+                "year": year,
+                "description": description,
+                "category_id": category_id,
+                "category": category.slug if category else None,
+                "genre": genres.get(pk, []),
+                "rating": total // count if count else None,
+                "rating_count": count,
+            }
+
+
+class Echo:
+    """Псевдо-файл для csv.writer: возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def to_ndjson(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    for chunk in chunked(rows, chunk_size):
+        yield "".join(
+            json.dumps(row, ensure_ascii=False) + "\n" for row in chunk
+        )
+
+
+def csv_value(value):
+    # Жанры — slug через пробел, отсутствующее значение — пустая ячейка.
+    if isinstance(value, list):
+        return " ".join(value)
+    return "" if value is None else value
+
+
+def to_csv(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for chunk in chunked(rows, chunk_size):
+        yield "".join(
+            writer.writerow([csv_value(row[field]) for field in EXPORT_FIELDS])
+            for row in chunk
+        )
+
+
+# Формат выгрузки: (content type, расширение файла, функция-сериализатор).
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv", to_csv),
+    "ndjson": ("application/x-ndjson; charset=utf-8", "ndjson", to_ndjson),
+}
+
+
+def export_titles(output_format, queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Итератор фрагментов текста выгрузки в формате output_format."""
+    _, _, serialize = EXPORT_FORMATS[output_format]
+    return serialize(iter_titles(queryset, chunk_size), chunk_size)
@@ -0,0 +1,170 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Max
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+SYLLABLES = (
+    "ба ве го ди жу зо ка ле ми но пу ра со ту фе ха це чи шу эр"
+).split()
+START_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+PERIOD_SECONDS = 10 * 365 * 24 * 60 * 60
+
+
+def zipf_counts(rnd, items, total, exponent, cap):
+    """
+    Распределяет около total элементов по items корзинам по закону Ципфа
+    (exponent=0 даёт равномерное распределение), не более cap в корзине.
+    Порядок корзин перемешан, чтобы популярность не зависела от id.
+    """
+    if not items:
+        return []
+    weights = [1 / rank**exponent for rank in range(1, items + 1)]
+    scale = total / sum(weights)
+    counts = [min(cap, int(weight * scale)) for weight in weights]
+    rnd.shuffle(counts)
+    return counts
+
+
+class DataGenerator:
+    """
+    Детерминированно (по seed) генерирует строки для всех таблиц.
+    Каждый метод возвращает заголовок и итератор строк в формате,
+    который принимает core.loader.TableLoader.
+    """
+
+    def __init__(self, seed=0, exponent=1.1, vocabulary_size=5000):
+        self.rnd = random.Random(seed)
+        self.exponent = exponent
+        self.words = [
+            "".join(self.rnd.choices(SYLLABLES, k=self.rnd.randint(2, 4)))
+            for _ in range(vocabulary_size)
+        ]
+
+    @staticmethod
+    def first_id(model):
+        return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+    def text(self, words):
+        return " ".join(self.rnd.choices(self.words, k=words))
+
+    def date(self):
+        return START_DATE + timedelta(
+            seconds=self.rnd.randrange(PERIOD_SECONDS)
+        )
+
+    def users(self, count):
+        start = self.first_id(User)
+        self.user_ids = range(start, start + count)
+        header = ("id", "username", "email", "confirmation_code")
+        rows = (
+            (
+                pk,
+                f"user{pk}",
+                f"user{pk}@yamdb.fake",
+                uuid.UUID(int=self.rnd.getrandbits(128), version=4),
+            )
+            for pk in self.user_ids
+        )
+        return header, rows
+
+    def categories(self, count):
+        start = self.first_id(Category)
+        self.category_ids = range(start, start + count)
+        header = ("id", "name", "slug")
+        rows = (
+            (pk, f"Категория {pk}", f"category_{pk}")
+            for pk in self.category_ids
+        )
+        return header, rows
+
+    def genres(self, count):
+        start = self.first_id(Genre)
+        self.genre_ids = range(start, start + count)
+        header = ("id", "name", "slug")
+        rows = ((pk, f"Жанр {pk}", f"genre_{pk}") for pk in self.genre_ids)
+        return header, rows
+
+    def titles(self, count):
+        start = self.first_id(Title)
+        self.title_ids = range(start, start + count)
+        header = ("id", "name", "year", "description", "category_id")
+        rows = (
+            (
+                pk,
+                self.text(self.rnd.randint(1, 4)).capitalize(),
+                self.rnd.randint(1900, 2020),
+                self.text(30),
+                self.rnd.choice(self.category_ids),
+            )
+            for pk in self.title_ids
+        )
+        return header, rows
+
+    def title_genres(self, max_per_title=3):
+        start = self.first_id(Title.genre.through)
+        header = ("id", "title_id", "genre_id")
+
+        def rows():
+            pk = start
+            genres = list(self.genre_ids)
+            for title_id in self.title_ids:
+                count = self.rnd.randint(1, min(max_per_title, len(genres)))
+                for genre_id in self.rnd.sample(genres, count):
+                    yield pk, title_id, genre_id
+                    pk += 1
+
+        return header, rows()
+
+    def reviews(self, total):
+        start = self.first_id(Review)
+        counts = zipf_counts(
+            self.rnd,
+            len(self.title_ids),
+            total,
+            self.exponent,
+            len(self.user_ids),
+        )
+        self.review_ids = range(start, start + sum(counts))
+        header = ("id", "title_id", "author_id", "score", "text", "pub_date")
+
+        def rows():
+            pk = start
+            for title_id, count in zip(self.title_ids, counts):
+                for author_id in self.rnd.sample(self.user_ids, count):
+                    yield (
+                        pk,
+                        title_id,
+                        author_id,
+                        self.rnd.randint(1, 10),
+                        self.text(20),
+                        self.date(),
+                    )
+                    pk += 1
+
+        return header, rows()
+
+    def comments(self, total):
+        start = self.first_id(Comment)
+        counts = zipf_counts(
+            self.rnd, len(self.review_ids), total, self.exponent, total
+        )
+        header = ("id", "review_id", "author_id", "text", "pub_date")
+
+        def rows():
+            pk = start
+            for review_id, count in zip(self.review_ids, counts):
+                for _ in range(count):
+                    yield (
+                        pk,
+                        review_id,
+                        self.rnd.choice(self.user_ids),
+                        self.text(10),
+                        self.date(),
+                    )
+                    pk += 1
+
+        return header, rows()
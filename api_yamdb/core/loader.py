@@ -0,0 +1,208 @@
+import csv
+from itertools import islice
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+# Файлы перечислены в порядке зависимостей по внешним ключам.
+CSV_FILES = (
+    ("users.csv", User),
+    ("category.csv", Category),
+    ("genre.csv", Genre),
+    ("titles.csv", Title),
+    ("genre_title.csv", Title.genre.through),
+    ("review.csv", Review),
+    ("comments.csv", Comment),
+)
+DEFAULT_BATCH_SIZE = 1000
+# Предел числа параметров одного запроса (PostgreSQL: 65535).
+MAX_QUERY_PARAMS = 65535
+# Колонки выгрузки export_titles, которые при загрузке не пишутся:
+# slug категории дублирует category_id, рейтинг пересчитывается.
+DERIVED_COLUMNS = {Title: ("category", "rating", "rating_count")}
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class TableLoader:
+    """
+    Вставляет строки CSV пачками через INSERT ... ON CONFLICT (pk)
+    DO UPDATE, поэтому повторная загрузка тех же файлов обновляет
+    строки, а не дублирует их. На SQLite пачка идёт через executemany
+    с одним подготовленным запросом; драйверы остальных баз выполняют
+    executemany построчно, поэтому для них пачка вставляется
+    многострочными VALUES.
+
+    Колонка связи многие-ко-многим (genre в выгрузке произведений)
+    содержит slug через пробел: связи строк пачки заменяются на них.
+    """
+
+    def __init__(self, model, header, using=DEFAULT_DB_ALIAS):
+        self.model = model
+        self.connection = connections[using]
+        opts = model._meta
+        derived = DERIVED_COLUMNS.get(model, ())
+        self.csv_fields, self.csv_indexes = [], []
+        self.m2m_columns, unknown = [], []
+        for index, column in enumerate(header):
+            if column in derived:
+                continue
+            try:
+                field = opts.get_field(column)
+            except FieldDoesNotExist:
+                unknown.append(column)
+                continue
+            if field.many_to_many:
+                self.m2m_columns.append((index, field))
+            elif field.concrete:
+                self.csv_fields.append(field)
+                self.csv_indexes.append(index)
+            else:
+                unknown.append(column)
+        if unknown:
+            raise ValueError(f"неизвестные колонки: {', '.join(unknown)}")
+        if self.m2m_columns and opts.pk not in self.csv_fields:
+            raise ValueError("для колонок связей нужна колонка id")
+        csv_columns = {field.column for field in self.csv_fields}
+        self.default_fields = [
+            field
+            for field in opts.concrete_fields
+            if field.column not in csv_columns and not field.primary_key
+        ]
+        self.multirow = self.connection.vendor != "sqlite"
+        self.rows_per_statement = max(
+            1, MAX_QUERY_PARAMS // len(self.csv_fields + self.default_fields)
+        )
+        self.sql = self.build_sql()
+
+    def build_sql(self, rows=1):
+        quote = self.connection.ops.quote_name
+        pk_column = self.model._meta.pk.column
+        fields = self.csv_fields + self.default_fields
+        columns = ", ".join(quote(field.column) for field in fields)
+        row = "(" + ", ".join(["%s"] * len(fields)) + ")"
+        updates = ", ".join(
+            f"{quote(field.column)} = EXCLUDED.{quote(field.column)}"
+            for field in self.csv_fields
+            if field.column != pk_column
+        )
+        action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        return (
+            f"INSERT INTO {quote(self.model._meta.db_table)} ({columns}) "
+            f"VALUES {', '.join([row] * rows)} "
+            f"ON CONFLICT ({quote(pk_column)}) {action}"
+        )
+
+    def prepare_value(self, field, value):
+        return field.get_db_prep_save(value, connection=self.connection)
+
+    def convert_row(self, row):
+        values = []
+        for field, index in zip(self.csv_fields, self.csv_indexes):
+            raw = row[index]
+            if raw == "" and field.null:
+                value = None
+            else:
+                value = field.to_python(raw)
+            values.append(self.prepare_value(field, value))
+        for field in self.default_fields:
+            if getattr(field, "auto_now", False) or getattr(
+                field, "auto_now_add", False
+            ):
+                value = timezone.now()
+            else:
+                value = field.get_default()
+            values.append(self.prepare_value(field, value))
+        return values
+
+    def insert(self, cursor, rows):
+        if not self.multirow:
+            cursor.executemany(self.sql, rows)
+            return
+        for chunk in chunked(rows, self.rows_per_statement):
+            cursor.execute(
+                self.build_sql(len(chunk)),
+                [value for row in chunk for value in row],
+            )
+
+    def load(self, rows, batch_size, progress=None):
+        """Загружает строки в одной транзакции, возвращает их количество."""
+        total = 0
+        with transaction.atomic(using=self.connection.alias):
+            with self.connection.cursor() as cursor:
+                for chunk in chunked(rows, batch_size):
+                    self.insert(
+                        cursor, [self.convert_row(row) for row in chunk]
+                    )
+                    self.set_links(chunk)
+                    total += len(chunk)
+                    if progress is not None:
+                        progress(total)
+                for sql in self.connection.ops.sequence_reset_sql(
+                    no_style(), [self.model]
+                ):
+                    cursor.execute(sql)
+        return total
+
+    def set_links(self, chunk):
+        """Заменяет связи многие-ко-многим строк пачки на slug из CSV."""
+        if not self.m2m_columns:
+            return
+        pk_index = self.csv_indexes[self.csv_fields.index(self.model._meta.pk)]
+        pks = [self.model._meta.pk.to_python(row[pk_index]) for row in chunk]
+        for index, field in self.m2m_columns:
+            slugs = [row[index].split() for row in chunk]
+            related = field.related_model.objects.using(
+                self.connection.alias
+            ).in_bulk(
+                {slug for row_slugs in slugs for slug in row_slugs},
+                field_name="slug",
+            )
+            unknown = {
+                slug
+                for row_slugs in slugs
+                for slug in row_slugs
+                if slug not in related
+            }
+            if unknown:
+                raise ValueError(
+                    f"{field.name}: не найдены {', '.join(sorted(unknown))}"
+                )
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            manager = through.objects.using(self.connection.alias)
+            manager.filter(**{f"{source}_id__in": pks}).delete()
+            manager.bulk_create(
+                [
+                    through(
+                        **{
+                            f"{source}_id": pk,
+                            f"{target}_id": related[slug].pk,
+                        }
+                    )
+                    for pk, row_slugs in zip(pks, slugs)
+                    for slug in dict.fromkeys(row_slugs)
+                ]
+            )
+
+
+def load_csv(path, model, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    with open(path, encoding="utf-8", newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        return TableLoader(model, header).load(reader, batch_size, progress)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exporter import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, export_titles
+
+
+class Command(BaseCommand):
+    help = "Выгружает все произведения в CSV или NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=tuple(EXPORT_FORMATS),
+            default="csv",
+            help="Формат выгрузки.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Файл для выгрузки (по умолчанию стандартный вывод).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Количество строк, читаемых из базы за раз.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size должен быть больше нуля.")
+        chunks = export_titles(
+            options["format"], chunk_size=options["chunk_size"]
+        )
+        if options["output"] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        # newline="" — переводы строк CSV уже расставлены csv.writer.
+        with open(
+            options["output"], "w", encoding="utf-8", newline=""
+        ) as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(
+            self.style.SUCCESS(f"Выгрузка записана в {options['output']}")
+        )
@@ -1,30 +1,61 @@
-import sqlite3
+import os
 
-import pandas
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+
+from core import versions
+from core.loader import CSV_FILES, DEFAULT_BATCH_SIZE, load_csv
+from reviews import search
+from reviews.ratings import recalculate_ratings
+
+SUPPORTED_VENDORS = ("sqlite", "postgresql")
 
 
 class Command(BaseCommand):
     help = "Наполняет базу данных из предоставленных файлов."
 
-    def handle(self, *args, **kwargs):
-        db = {
-            "static/data/category.csv": "reviews_category",
-            "static/data/comments.csv": "reviews_comment",
-            "static/data/genre.csv": "reviews_genre",
-            "static/data/genre_title.csv": "reviews_genre_title",
-            "static/data/review.csv": "reviews_review",
-            "static/data/titles.csv": "reviews_title",
-            "static/data/users.csv": "users_user",
-        }
-
-        for path, name in db.items():
-            df = pandas.read_csv(path)
-            con = sqlite3.connect("db.sqlite3")
-            df.to_sql(
-                name,
-                con,
-                if_exists="append",
-                index=False,
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=os.path.join(settings.BASE_DIR, "static", "data"),
+            help="Папка с CSV-файлами.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Количество строк в одной пачке вставки.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            raise CommandError(
+                f"Загрузка не поддерживается для базы {connection.vendor}."
+            )
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть больше нуля.")
+
+        for filename, model in CSV_FILES:
+            path = os.path.join(options["path"], filename)
+            if not os.path.exists(path):
+                self.stdout.write(self.style.WARNING(f"Пропущен {path}"))
+                continue
+
+            def progress(total):
+                self.stdout.write(f"{filename}: {total}", ending="\r")
+                self.stdout.flush()
+
+            try:
+                total = load_csv(path, model, options["batch_size"], progress)
+            except (DatabaseError, ValueError) as error:
+                raise CommandError(f"{filename}: {error}") from error
+            self.stdout.write(
+                self.style.SUCCESS(f"{filename}: загружено строк {total}")
             )
-            con.commit()
+
+        # Строки вставлены в обход моделей: пересчитываем производные данные.
+        recalculate_ratings()
+        search.rebuild_index()
+        versions.bump(versions.GLOBAL)
+        self.stdout.write(self.style.SUCCESS("Загрузка завершена."))
@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+
+from core import versions
+from core.generator import DataGenerator
+from core.loader import DEFAULT_BATCH_SIZE, TableLoader
+from reviews import search
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import recalculate_ratings
+from users.models import User
+
+from .filling_db import SUPPORTED_VENDORS
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует синтетические данные для нагрузочного тестирования: "
+        "отзывы по произведениям и комментарии по отзывам распределены "
+        "по закону Ципфа."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=5)
+        parser.add_argument("--genres", type=int, default=30)
+        parser.add_argument("--titles", type=int, default=1000)
+        parser.add_argument("--reviews", type=int, default=10000)
+        parser.add_argument("--comments", type=int, default=20000)
+        parser.add_argument(
+            "--zipf",
+            type=float,
+            default=1.1,
+            help="Показатель распределения Ципфа, 0 — равномерно.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            raise CommandError(
+                f"Генерация не поддерживается для базы {connection.vendor}."
+            )
+        if options["categories"] < 1 or options["genres"] < 1:
+            raise CommandError("Нужна хотя бы одна категория и один жанр.")
+
+        generator = DataGenerator(options["seed"], options["zipf"])
+        tables = (
+            (User, lambda: generator.users(options["users"])),
+            (Category, lambda: generator.categories(options["categories"])),
+            (Genre, lambda: generator.genres(options["genres"])),
+            (Title, lambda: generator.titles(options["titles"])),
+            (Title.genre.through, generator.title_genres),
+            (Review, lambda: generator.reviews(options["reviews"])),
+            (Comment, lambda: generator.comments(options["comments"])),
+        )
+        for model, make_rows in tables:
+            name = model._meta.db_table
+            header, rows = make_rows()
+
+            def progress(total):
+                self.stdout.write(f"{name}: {total}", ending="\r")
+                self.stdout.flush()
+
+            started = time.perf_counter()
+            try:
+                total = TableLoader(model, header).load(
+                    rows, options["batch_size"], progress
+                )
+            except DatabaseError as error:
+                raise CommandError(f"{name}: {error}") from error
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: создано строк {total} "
+                    f"за {time.perf_counter() - started:.1f} с"
+                )
+            )
+
+        recalculate_ratings()
+        search.rebuild_index()
+        versions.bump(versions.GLOBAL)
+        self.stdout.write(self.style.SUCCESS("Генерация завершена."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import is_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Перестраивает полнотекстовый индекс произведений (SQLite FTS5)."
+
+    def handle(self, *args, **kwargs):
+        if not is_enabled():
+            self.stdout.write(
+                self.style.WARNING(
+                    "Полнотекстовый индекс доступен только для SQLite."
+                )
+            )
+            return
+        count = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f"Проиндексировано произведений: {count}")
+        )
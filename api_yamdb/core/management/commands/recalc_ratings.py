@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core import versions
+from reviews.ratings import recalculate_ratings
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает сохранённые рейтинги произведений по отзывам."
+
+    def handle(self, *args, **kwargs):
+        updated = recalculate_ratings()
+        versions.bump(versions.TITLES)
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитан рейтинг произведений: {updated}")
+        )
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.rankings import refresh_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        "Перестраивает топ произведений (общий, по категориям и жанрам). "
+        "Запускайте периодически, например из cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=settings.TOP_TITLES_SIZE,
+            help="Сколько произведений хранить в каждом разрезе.",
+        )
+        parser.add_argument(
+            "--prior",
+            type=float,
+            default=settings.TOP_TITLES_PRIOR,
+            help="Вес средней оценки в байесовской оценке (0 — без неё).",
+        )
+
+    def handle(self, *args, **options):
+        if options["size"] < 1:
+            raise CommandError("--size должен быть больше нуля.")
+        if options["prior"] < 0:
+            raise CommandError("--prior не может быть отрицательным.")
+        total = refresh_rankings(options["size"], options["prior"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Записано мест в рейтингах: {total}")
+        )
@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Отправляет письма из очереди core_outboxemail пачками через "
+        "одно соединение с почтовым сервером. С --loop работает "
+        "постоянно, проверяя очередь каждые --interval секунд."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Сколько писем захватывать за раз.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, когда очередь опустела.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Пауза между проверками очереди в режиме --loop, с.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть больше нуля.")
+        while True:
+            sent, failed = send_pending(options["batch_size"])
+            if sent or failed or not options["loop"]:
+                self.stdout.write(
+                    f"Отправлено писем: {sent}, с ошибкой: {failed}"
+                )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,120 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import routers
+
+logger = logging.getLogger("core.db")
+
+
+class QueryStats:
+    """
+    Обёртка execute_wrapper: считает запросы, их суммарное время,
+    самые медленные запросы и повторы одного и того же SQL (N+1).
+    Работает без DEBUG, так как не использует connection.queries.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+        self.templates = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            self.templates[sql] += 1
+            limit = settings.DB_SLOWEST_QUERIES
+            self.slowest.append((duration, sql))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            self.slowest = self.slowest[:limit]
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    def n_plus_one(self, threshold):
+        """SQL-шаблоны, выполненные в запросе не меньше threshold раз."""
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in self.templates.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryCountMiddleware:
+    """
+    Отдаёт число SQL-запросов и время работы с БД в заголовках
+    X-DB-Queries и X-DB-Time и пишет их в лог одной JSON-строкой.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        response["X-DB-Queries"] = str(stats.count)
+        response["X-DB-Time"] = f"{stats.duration_ms:.2f}"
+        self.log(request, response, stats)
+        return response
+
+    def log(self, request, response, stats):
+        n_plus_one = stats.n_plus_one(settings.DB_N_PLUS_ONE_THRESHOLD)
+        slow = stats.duration_ms >= settings.DB_SLOW_QUERY_MS
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "db_queries": stats.count,
+            "db_time_ms": round(stats.duration_ms, 2),
+            "slowest": [
+                {"sql": sql, "time_ms": round(duration * 1000, 2)}
+                for duration, sql in stats.slowest
+            ],
+            "n_plus_one": n_plus_one,
+        }
+        level = logging.WARNING if n_plus_one or slow else logging.INFO
+        logger.log(level, json.dumps(record, ensure_ascii=False))
+
+
+class PrimaryStickyMiddleware:
+    """
+    Сбрасывает маршрутизацию чтений (core.routers) на каждый запрос.
+    Если запрос что-то записал, ставит клиенту cookie на
+    DB_PRIMARY_STICKY_SECONDS: его следующие чтения идут в primary,
+    пока реплики догоняют запись.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routers.reset()
+        try:
+            response = self.get_response(request)
+            if settings.REPLICA_DATABASES and routers.has_written():
+                response.set_cookie(
+                    routers.STICKY_COOKIE,
+                    "1",
+                    max_age=settings.DB_PRIMARY_STICKY_SECONDS,
+                    httponly=True,
+                    samesite="Lax",
+                )
+            return response
+        finally:
+            routers.reset()
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="CollectionVersion",
+            fields=[
+                (
+                    "key",
+                    models.CharField(
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Коллекция",
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Версия"
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Изменена"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Версия коллекции",
+                "verbose_name_plural": "Версии коллекций",
+            },
+        ),
+    ]
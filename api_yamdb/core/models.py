@@ -0,0 +1,62 @@
+from django.db import models
+from django.utils.timezone import now
+
+
+class CollectionVersion(models.Model):
+    """Счётчик изменений коллекции для ETag и Last-Modified."""
+
+    key = models.CharField("Коллекция", max_length=64, primary_key=True)
+    version = models.PositiveBigIntegerField("Версия", default=0)
+    updated = models.DateTimeField("Изменена", auto_now=True)
+
+    class Meta:
+        verbose_name = "Версия коллекции"
+        verbose_name_plural = "Версии коллекций"
+
+    def __str__(self):
+        return f"{self.key}: {self.version}"
+
+
+class OutboxEmail(models.Model):
+    """
+    Письмо в очереди на отправку. Строка пишется в одной транзакции
+    с изменением, которое её вызвало, а доставляет письма команда
+    send_outbox (core.outbox).
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, "Ожидает отправки"),
+        (SENT, "Отправлено"),
+        (FAILED, "Не доставлено"),
+    )
+
+    subject = models.CharField("Тема", max_length=255)
+    body = models.TextField("Текст")
+    from_email = models.CharField("Отправитель", max_length=254, blank=True)
+    to = models.JSONField("Получатели")
+    status = models.CharField(
+        "Статус", max_length=16, choices=STATUSES, default=PENDING
+    )
+    attempts = models.PositiveIntegerField("Попыток", default=0)
+    next_attempt = models.DateTimeField("Следующая попытка", default=now)
+    claim = models.CharField(
+        "Захвачено обработчиком", max_length=32, blank=True
+    )
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    created = models.DateTimeField("Создано", auto_now_add=True)
+    sent = models.DateTimeField("Отправлено", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt"], name="outbox_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)}"
@@ -0,0 +1,134 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger("core.outbox")
+
+
+def enqueue(subject, body, to, from_email=""):
+    """
+    Ставит письмо в очередь. Вызывайте в транзакции изменения, ради
+    которого письмо отправляется: они сохранятся вместе.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject, body=body, to=list(to), from_email=from_email or ""
+    )
+
+
+def backoff(attempts):
+    """Пауза перед следующей попыткой: удваивается после каждой ошибки."""
+    delay = settings.EMAIL_OUTBOX_BACKOFF * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_BACKOFF))
+
+
+def claim(batch_size):
+    """
+    Захватывает до batch_size писем, срок отправки которых наступил.
+    Захват — условный UPDATE с меткой обработчика и арендой
+    EMAIL_OUTBOX_LEASE секунд: параллельные обработчики не отправят
+    одно письмо дважды, а письма упавшего обработчика вернутся
+    в очередь по истечении аренды.
+    """
+    now = timezone.now()
+    due = OutboxEmail.objects.filter(
+        status=OutboxEmail.PENDING, next_attempt__lte=now
+    )
+    ids = list(
+        due.order_by("next_attempt", "pk").values_list("pk", flat=True)[
+            :batch_size
+        ]
+    )
+    if not ids:
+        return []
+    token = uuid.uuid4().hex
+    due.filter(pk__in=ids).update(
+        claim=token,
+        next_attempt=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE),
+    )
+    return list(OutboxEmail.objects.filter(claim=token).order_by("pk"))
+
+
+def open_connection(connection):
+    """
+    Открывает соединение, не прерывая обработку: если сервер недоступен,
+    ошибку получит отправка письма и оно уйдёт на повтор.
+    """
+    try:
+        connection.open()
+    except Exception as error:
+        logger.warning(
+            "Не удалось подключиться к почтовому серверу: %s", error
+        )
+
+
+def deliver(emails, connection):
+    """
+    Отправляет захваченные письма через одно открытое соединение
+    и сохраняет результат одним bulk_update. Возвращает (sent, failed).
+    """
+    sent = failed = 0
+    for email in emails:
+        message = EmailMessage(
+            email.subject,
+            email.body,
+            email.from_email or None,
+            email.to,
+            connection=connection,
+        )
+        email.attempts += 1
+        email.claim = ""
+        try:
+            message.send()
+        except Exception as error:
+            logger.warning("Письмо %s не отправлено: %s", email.pk, error)
+            email.last_error = str(error)
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = OutboxEmail.FAILED
+            else:
+                email.next_attempt = timezone.now() + backoff(email.attempts)
+            failed += 1
+            # Сервер мог закрыть соединение: следующее письмо пойдёт
+            # по новому.
+            connection.close()
+            open_connection(connection)
+            continue
+        email.status = OutboxEmail.SENT
+        email.sent = timezone.now()
+        email.last_error = ""
+        sent += 1
+    OutboxEmail.objects.bulk_update(
+        emails,
+        ["status", "attempts", "next_attempt", "claim", "last_error", "sent"],
+    )
+    return sent, failed
+
+
+def send_pending(batch_size=None):
+    """
+    Отправляет все письма, срок которых наступил, пачками по batch_size
+    через одно SMTP-соединение. Возвращает (sent, failed).
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    sent = failed = 0
+    connection = None
+    try:
+        while True:
+            emails = claim(batch_size)
+            if not emails:
+                break
+            if connection is None:
+                connection = get_connection()
+                open_connection(connection)
+            batch_sent, batch_failed = deliver(emails, connection)
+            sent += batch_sent
+            failed += batch_failed
+    finally:
+        if connection is not None:
+            connection.close()
+    return sent, failed
@@ -0,0 +1,54 @@
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Cookie «недавно писал»: пока она жива, чтения клиента идут в primary,
+# чтобы он сразу видел свои изменения, даже если реплика отстаёт.
+STICKY_COOKIE = "db_primary"
+
+_state = threading.local()
+
+
+def reset():
+    """Сбрасывает состояние маршрутизации текущего запроса."""
+    _state.replica = None
+    _state.written = False
+
+
+def read_from_replica():
+    """
+    Направляет дальнейшие чтения запроса на случайную реплику из
+    settings.REPLICA_DATABASES (без реплик чтения остаются в primary).
+    Первая запись возвращает чтения в primary до конца запроса.
+    """
+    if settings.REPLICA_DATABASES and not has_written():
+        _state.replica = random.choice(settings.REPLICA_DATABASES)
+
+
+def has_written():
+    return getattr(_state, "written", False)
+
+
+def primary_required(request):
+    return STICKY_COOKIE in request.COOKIES
+
+
+class PrimaryReplicaRouter:
+    """
+    Записи всегда идут в primary (default). Чтения идут в реплику,
+    только если запрос включил их через read_from_replica().
+    """
+
+    def db_for_read(self, model, **hints):
+        return getattr(_state, "replica", None)
+
+    def db_for_write(self, model, **hints):
+        _state.replica = None
+        _state.written = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии primary: связи между ними допустимы.
+        return True
@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users import tokens
+from users.models import User
+
+from . import connections, sqlite, versions
+
+
+@receiver(connection_created)
+def configure_database(sender, connection, **kwargs):
+    sqlite.configure_connection(connection, settings.SQLITE_PRAGMAS)
+
+
+@receiver(request_started)
+def check_connections(sender, **kwargs):
+    if not connections.NATIVE_HEALTH_CHECKS:
+        connections.close_unusable_connections()
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_changed(sender, **kwargs):
+    versions.bump(versions.TITLES)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def catalog_changed(sender, **kwargs):
+    versions.bump(versions.TITLES, versions.CATALOG)
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_title(sender, instance, **kwargs):
+    # Отзыв можно перенести к другому произведению: запоминаем прежнее.
+    instance._previous_title_id = getattr(
+        instance, "_loaded_rating", (None, None)
+    )[0]
+
+
+@receiver(post_save, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    keys = [versions.TITLES, versions.reviews_key(instance.title_id)]
+    previous_title_id = getattr(instance, "_previous_title_id", None)
+    if previous_title_id is not None:
+        keys.append(versions.reviews_key(previous_title_id))
+    versions.bump(*keys)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    # Комментарии отзыва удаляются каскадом без сигналов.
+    versions.bump(
+        versions.TITLES,
+        versions.reviews_key(instance.title_id),
+        versions.comments_key(instance.pk),
+    )
+
+
+# Удаление комментариев учитывает CommentViewSet: получатель post_delete
+# на каждую строку отключил бы их быстрое каскадное удаление вместе
+# с отзывом.
+@receiver(post_save, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    if Comment.review.is_cached(instance):
+        title_id = instance.review.title_id
+    else:
+        title_id = (
+            Review.objects.filter(pk=instance.review_id)
+            .values_list("title_id", flat=True)
+            .first()
+        )
+    versions.bump(
+        versions.comments_key(instance.review_id),
+        versions.reviews_key(title_id),
+    )
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    # Имя автора встроено в отзывы и комментарии.
+    if not created and instance.username != getattr(
+        instance, "_loaded_username", None
+    ):
+        versions.bump(versions.USERS)
+    user_id, version = instance.pk, instance.token_version
+    if instance.is_active:
+        transaction.on_commit(
+            lambda: tokens.remember_token_version(user_id, version)
+        )
+    else:
+        transaction.on_commit(lambda: tokens.forget_token_version(user_id))
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    # Отзывы и комментарии пользователя удаляются каскадом без сигналов;
+    # затронутых коллекций может быть много, поэтому меняем общую версию.
+    if (
+        Review.objects.filter(author=instance).exists()
+        or Comment.objects.filter(author=instance).exists()
+    ):
+        versions.bump(versions.GLOBAL)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: tokens.forget_token_version(user_id))
@@ -0,0 +1,47 @@
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+
+# PRAGMA, которые можно задать через settings.SQLITE_PRAGMAS.
+# Значения подставляются в SQL как есть, поэтому и имена,
+# и значения проверяются заранее.
+ALLOWED_PRAGMAS = (
+    "journal_mode",
+    "synchronous",
+    "busy_timeout",
+    "mmap_size",
+    "cache_size",
+    "temp_store",
+    "foreign_keys",
+    "wal_autocheckpoint",
+)
+PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+
+def pragma_statements(pragmas):
+    """SQL PRAGMA для непустых значений словаря pragmas."""
+    statements = []
+    for name, value in pragmas.items():
+        if value is None or str(value) == "":
+            continue
+        if name not in ALLOWED_PRAGMAS:
+            raise ImproperlyConfigured(f"Неизвестная PRAGMA SQLite: {name}.")
+        if not PRAGMA_VALUE.match(str(value)):
+            raise ImproperlyConfigured(
+                f"Недопустимое значение PRAGMA {name}: {value!r}."
+            )
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def configure_connection(connection, pragmas):
+    """
+    Выполняет PRAGMA на новом соединении с SQLite. journal_mode=wal
+    сохраняется в файле базы; у базы в памяти SQLite оставляет
+    режим memory.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(pragmas):
+            cursor.execute(statement)
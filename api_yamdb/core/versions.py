@@ -0,0 +1,58 @@
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CollectionVersion
+
+# Общая версия: меняется при массовой загрузке данных в обход моделей
+# и входит в валидаторы любой коллекции.
+GLOBAL = "global"
+TITLES = "titles"
+CATALOG = "catalog"
+USERS = "users"
+
+
+def reviews_key(title_id):
+    return f"reviews:{title_id}"
+
+
+def comments_key(review_id):
+    return f"comments:{review_id}"
+
+
+def bump(*keys):
+    """Увеличивает версии коллекций, создавая недостающие счётчики."""
+    now = timezone.now()
+    for key in set(keys):
+        updated = CollectionVersion.objects.filter(key=key).update(
+            version=F("version") + 1, updated=now
+        )
+        if updated:
+            continue
+        try:
+            with transaction.atomic():
+                CollectionVersion.objects.create(key=key, version=1)
+        except IntegrityError:
+            CollectionVersion.objects.filter(key=key).update(
+                version=F("version") + 1, updated=now
+            )
+
+
+def get_validators(keys, salt=""):
+    """
+    Возвращает (etag, last_modified) для набора коллекций одним запросом.
+    last_modified равен None, если ни одна коллекция ещё не менялась.
+    """
+    keys = [GLOBAL, *keys]
+    versions = dict.fromkeys(keys, 0)
+    last_modified = None
+    for key, version, updated in CollectionVersion.objects.filter(
+        key__in=keys
+    ).values_list("key", "version", "updated"):
+        versions[key] = version
+        if last_modified is None or updated > last_modified:
+            last_modified = updated
+    raw = salt + "|" + ",".join(f"{key}={versions[key]}" for key in keys)
+    return hashlib.md5(raw.encode()).hexdigest(), last_modified
@@ -0,0 +1,90 @@
+import threading
+import time
+
+from django.conf import settings
+
+from core import versions
+
+from .models import Category, Genre
+
+
+class CatalogCache:
+    """
+    Процесс-локальный кэш небольшого справочника (slug → объект).
+
+    Записи справочника в этом процессе сбрасывают кэш сигналами сразу;
+    изменения из других процессов замечаются по версии коллекции,
+    которая перечитывается из БД не чаще раза в CATALOG_CACHE_TTL секунд.
+    """
+
+    def __init__(self, model, version_key):
+        self.model = model
+        self.version_key = version_key
+        self.lock = threading.Lock()
+        self.invalidate()
+
+    def __deepcopy__(self, memo):
+        # Поля DRF копируются для каждого сериализатора, кэш общий.
+        return self
+
+    def invalidate(self):
+        self.version = None
+        self.checked_at = 0.0
+        self.by_slug = {}
+        self.by_id = {}
+
+    def refresh(self):
+        now = time.monotonic()
+        if now - self.checked_at < settings.CATALOG_CACHE_TTL:
+            return
+        with self.lock:
+            version, _ = versions.get_validators([self.version_key])
+            if version != self.version:
+                objects = list(self.model.objects.all())
+                self.by_slug = {obj.slug: obj for obj in objects}
+                self.by_id = {obj.pk: obj for obj in objects}
+                self.version = version
+            self.checked_at = now
+
+    def get(self, slug):
+        """Объект по slug или None; промах перепроверяется по БД."""
+        self.refresh()
+        obj = self.by_slug.get(slug)
+        if obj is None:
+            obj = self.model.objects.filter(slug=slug).first()
+            if obj is not None:
+                self.invalidate()
+        return obj
+
+    def get_many(self, slugs):
+        """
+        Словарь slug → объект для всех найденных slug; отсутствующие
+        в кэше перепроверяются по БД одним запросом IN.
+        """
+        self.refresh()
+        found = {
+            slug: self.by_slug[slug] for slug in slugs if slug in self.by_slug
+        }
+        missing = set(slugs) - found.keys()
+        if missing:
+            loaded = {
+                obj.slug: obj
+                for obj in self.model.objects.filter(slug__in=missing)
+            }
+            if loaded:
+                found.update(loaded)
+                self.invalidate()
+        return found
+
+    def get_by_id(self, pk):
+        self.refresh()
+        obj = self.by_id.get(pk)
+        if obj is None and pk is not None:
+            obj = self.model.objects.filter(pk=pk).first()
+            if obj is not None:
+                self.invalidate()
+        return obj
+
+
+categories = CatalogCache(Category, versions.CATALOG)
+genres = CatalogCache(Genre, versions.CATALOG)
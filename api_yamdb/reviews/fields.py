@@ -0,0 +1,19 @@
+from django.db import models
+from django.db.models import Lookup
+
+
+class FullTextField(models.TextField):
+    """
+    Скрытый столбец виртуальной таблицы SQLite FTS5 с именем самой
+    таблицы: по нему выполняется MATCH сразу по всем столбцам индекса.
+    """
+
+
+@FullTextField.register_lookup
+class Match(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
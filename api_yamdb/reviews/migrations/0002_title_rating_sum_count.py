@@ -0,0 +1,57 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Title = apps.get_model("reviews", "Title")
+    Review = apps.get_model("reviews", "Review")
+    scores = (
+        Review.objects.using(db_alias)
+        .filter(title=OuterRef("pk"))
+        .order_by()
+        .values("title")
+    )
+    Title.objects.using(db_alias).update(
+        rating_sum=Coalesce(
+            Subquery(
+                scores.annotate(total=Sum("score")).values("total"),
+                output_field=models.IntegerField(),
+            ),
+            0,
+        ),
+        rating_count=Coalesce(
+            Subquery(
+                scores.annotate(total=Count("pk")).values("total"),
+                output_field=models.IntegerField(),
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="title",
+            name="rating_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Количество оценок"
+            ),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="rating_sum",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Сумма оценок"
+            ),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
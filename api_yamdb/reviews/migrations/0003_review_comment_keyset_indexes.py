@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0002_title_rating_sum_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["review", "pub_date", "id"],
+                name="comment_review_keyset_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["title", "pub_date", "id"],
+                name="review_title_keyset_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import reviews.fields
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_title_fts USING fts5("
+        "name, description, tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO reviews_title_fts(reviews_title_fts, rank) "
+        "VALUES ('rank', 'bm25(10.0, 1.0)')"
+    )
+    schema_editor.execute(
+        "INSERT INTO reviews_title_fts(rowid, name, description) "
+        "SELECT id, name, description FROM reviews_title"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS reviews_title_fts")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0003_review_comment_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TitleSearchIndex",
+            fields=[
+                (
+                    "title",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="reviews.title",
+                    ),
+                ),
+                ("name", models.TextField()),
+                ("description", models.TextField()),
+                (
+                    "document",
+                    reviews.fields.FullTextField(
+                        db_column="reviews_title_fts"
+                    ),
+                ),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "reviews_title_fts",
+                "managed": False,
+            },
+        ),
+        migrations.AlterField(
+            model_name="title",
+            name="description",
+            field=models.TextField(blank=True, verbose_name="Описание"),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def fill_rating_mean(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Title = apps.get_model("reviews", "Title")
+    Title.objects.using(db_alias).update(
+        rating_mean=Coalesce(
+            Cast(F("rating_sum"), models.FloatField())
+            / NullIf(F("rating_count"), 0),
+            Value(0.0),
+            output_field=models.FloatField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0005_title_score_histogram"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TitleRanking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[
+                            ("all", "Все произведения"),
+                            ("category", "Категория"),
+                            ("genre", "Жанр"),
+                        ],
+                        max_length=16,
+                        verbose_name="Разрез",
+                    ),
+                ),
+                (
+                    "scope_id",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="id категории или жанра"
+                    ),
+                ),
+                (
+                    "position",
+                    models.PositiveIntegerField(verbose_name="Место"),
+                ),
+                ("score", models.FloatField(verbose_name="Оценка")),
+            ],
+            options={
+                "verbose_name": "Место в рейтинге",
+                "verbose_name_plural": "Рейтинги произведений",
+                "ordering": ("scope", "scope_id", "position"),
+            },
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="rating_mean",
+            field=models.FloatField(
+                default=0, editable=False, verbose_name="Средняя оценка"
+            ),
+        ),
+        migrations.RunPython(fill_rating_mean, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["-rating_mean", "-id"], name="title_rating_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["-rating_count", "-id"], name="title_reviews_count_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="titleranking",
+            name="title",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rankings",
+                to="reviews.title",
+                verbose_name="Произведение",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="titleranking",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "scope_id", "position"),
+                name="unique_ranking_position",
+            ),
+        ),
+    ]
@@ -7,8 +7,26 @@ from django.db import models
 
 from users.models import User
 
+from .fields import FullTextField
 from .validators import validate_year
 
+MIN_SCORE = 1
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def score_column(score):
+    """Имя поля Title со счётчиком отзывов с оценкой score."""
+    return f"score_{score}"
+
+
+def score_count_field(score):
+    return models.PositiveIntegerField(
+        f"Оценок {score}",
+        default=0,
+        editable=False,
+    )
+
 
 class Category(models.Model):
     """Модель для категорий."""
@@ -72,7 +90,6 @@ class Title(models.Model):
     )
     description = models.TextField(
         "Описание",
-        db_index=True,
         blank=True,
     )
     genre = models.ManyToManyField(
@@ -90,10 +107,45 @@ class Title(models.Model):
     year = models.IntegerField(
         "Год выпуска", null=False, db_index=True, validators=[validate_year]
     )
+    rating_sum = models.PositiveIntegerField(
+        "Сумма оценок",
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        "Количество оценок",
+        default=0,
+        editable=False,
+    )
+    rating_mean = models.FloatField(
+        "Средняя оценка",
+        default=0,
+        editable=False,
+    )
+    # Гистограмма оценок: число отзывов с каждой оценкой от 1 до 10.
+    score_1 = score_count_field(1)
+    score_2 = score_count_field(2)
+    score_3 = score_count_field(3)
+    score_4 = score_count_field(4)
+    score_5 = score_count_field(5)
+    score_6 = score_count_field(6)
+    score_7 = score_count_field(7)
+    score_8 = score_count_field(8)
+    score_9 = score_count_field(9)
+    score_10 = score_count_field(10)
 
     class Meta:
         verbose_name = "Произведение"
         verbose_name_plural = "Произведения"
+        indexes = [
+            models.Index(
+                name="title_rating_idx", fields=["-rating_mean", "-id"]
+            ),
+            models.Index(
+                name="title_reviews_count_idx",
+                fields=["-rating_count", "-id"],
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -104,6 +156,75 @@ class Title(models.Model):
         if self.year is not None:
             validate_year(self.year)
 
+    @property
+    def rating(self):
+        """Средняя оценка (целое число) или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum // self.rating_count
+
+
+class TitleSearchIndex(models.Model):
+    """
+    Полнотекстовый индекс FTS5 по названию и описанию произведений.
+    Виртуальная таблица создаётся миграцией только для SQLite.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        on_delete=models.DO_NOTHING,
+        related_name="search_index",
+    )
+    name = models.TextField()
+    description = models.TextField()
+    document = FullTextField(db_column="reviews_title_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "reviews_title_fts"
+
+
+class TitleRanking(models.Model):
+    """
+    Материализованный топ произведений по байесовской оценке: общий,
+    по категориям и по жанрам. Перестраивается командой refresh_rankings.
+    """
+
+    ALL = "all"
+    CATEGORY = "category"
+    GENRE = "genre"
+    SCOPES = (
+        (ALL, "Все произведения"),
+        (CATEGORY, "Категория"),
+        (GENRE, "Жанр"),
+    )
+
+    scope = models.CharField("Разрез", max_length=16, choices=SCOPES)
+    scope_id = models.PositiveIntegerField("id категории или жанра", default=0)
+    position = models.PositiveIntegerField("Место")
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="rankings",
+        verbose_name="Произведение",
+    )
+    score = models.FloatField("Оценка")
+
+    class Meta:
+        verbose_name = "Место в рейтинге"
+        verbose_name_plural = "Рейтинги произведений"
+        ordering = ("scope", "scope_id", "position")
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_ranking_position",
+                fields=["scope", "scope_id", "position"],
+            ),
+        ]
+
 
 class Review(models.Model):
     """Модель для отзывов."""
@@ -120,8 +241,8 @@ class Review(models.Model):
         verbose_name="Рейтинг",
         db_index=True,
         validators=[
-            MinValueValidator(1),
-            MaxValueValidator(10),
+            MinValueValidator(MIN_SCORE),
+            MaxValueValidator(MAX_SCORE),
         ],
     )
     text = models.TextField("Текст ревью", null=False, blank=False)
@@ -140,8 +261,25 @@ class Review(models.Model):
                 fields=["title", "author"],
             ),
         ]
+        indexes = [
+            models.Index(
+                name="review_title_keyset_idx",
+                fields=["title", "pub_date", "id"],
+            ),
+        ]
         default_related_name = "reviews"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем исходные значения, чтобы при обновлении отзыва
+        # скорректировать сохранённый рейтинг произведения на разницу.
+        instance._loaded_rating = (
+            instance.__dict__.get("title_id"),
+            instance.__dict__.get("score"),
+        )
+        return instance
+
 
 class Comment(models.Model):
     """Модель для комментариев."""
@@ -161,3 +299,9 @@ class Comment(models.Model):
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
         default_related_name = "comments"
+        indexes = [
+            models.Index(
+                name="comment_review_keyset_idx",
+                fields=["review", "pub_date", "id"],
+            ),
+        ]
@@ -0,0 +1,101 @@
+from django.db import transaction
+from django.db.models import F, FloatField, Sum, Value
+from django.db.models.functions import Cast
+
+from core.loader import chunked
+
+from .models import Title, TitleRanking
+
+BATCH_SIZE = 1000
+
+
+def global_mean():
+    """Средняя оценка по всем отзывам (0, если отзывов нет)."""
+    totals = Title.objects.aggregate(
+        total=Sum("rating_sum"), count=Sum("rating_count")
+    )
+    if not totals["count"]:
+        return 0.0
+    return totals["total"] / totals["count"]
+
+
+def bayesian_score(prefix, prior, mean):
+    """
+    (prior * mean + сумма оценок) / (prior + число оценок): у произведений
+    с парой отзывов оценка тянется к средней по всем произведениям.
+    При prior=0 это обычная средняя оценка.
+    """
+    total = F(f"{prefix}rating_sum")
+    count = F(f"{prefix}rating_count")
+    return Cast(Value(prior * mean) + total, FloatField()) / Cast(
+        Value(prior) + count, FloatField()
+    )
+
+
+def top_per_scope(rows, size):
+    """Первые size строк каждой группы из потока, упорядоченного по ней."""
+    current, taken = None, 0
+    for scope_id, title_id, score in rows:
+        if scope_id != current:
+            current, taken = scope_id, 0
+        if taken < size:
+            taken += 1
+            yield scope_id, taken, title_id, score
+
+
+def ranking_rows(size, prior):
+    """Строки (разрез, id разреза, место, id произведения, оценка)."""
+    mean = global_mean()
+    titles = Title.objects.filter(rating_count__gt=0).annotate(
+        score=bayesian_score("", prior, mean)
+    )
+    for position, (title_id, score) in enumerate(
+        titles.order_by("-score", "-id").values_list("id", "score")[:size],
+        start=1,
+    ):
+        yield TitleRanking.ALL, 0, position, title_id, score
+
+    by_category = (
+        titles.filter(category__isnull=False)
+        .order_by("category_id", "-score", "-id")
+        .values_list("category_id", "id", "score")
+        .iterator()
+    )
+    for row in top_per_scope(by_category, size):
+        yield (TitleRanking.CATEGORY, *row)
+
+    by_genre = (
+        Title.genre.through.objects.filter(title__rating_count__gt=0)
+        .annotate(score=bayesian_score("title__", prior, mean))
+        .order_by("genre_id", "-score", "-title_id")
+        .values_list("genre_id", "title_id", "score")
+        .iterator()
+    )
+    for row in top_per_scope(by_genre, size):
+        yield (TitleRanking.GENRE, *row)
+
+
+def refresh_rankings(size, prior):
+    """
+    Перестраивает таблицу TitleRanking в одной транзакции, чтобы читатели
+    видели либо старый, либо новый рейтинг. Возвращает число строк.
+    """
+    rankings = (
+        TitleRanking(
+            scope=scope,
+            scope_id=scope_id,
+            position=position,
+            title_id=title_id,
+            score=score,
+        )
+        for scope, scope_id, position, title_id, score in ranking_rows(
+            size, prior
+        )
+    )
+    total = 0
+    with transaction.atomic():
+        TitleRanking.objects.all().delete()
+        for chunk in chunked(rankings, BATCH_SIZE):
+            TitleRanking.objects.bulk_create(chunk)
+            total += len(chunk)
+    return total
@@ -0,0 +1,84 @@
+from django.db.models import (
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from .models import SCORES, Review, Title, score_column
+
+HISTOGRAM_COLUMNS = tuple(score_column(score) for score in SCORES)
+
+
+def mean_expression(total, count):
+    """SQL-выражение средней оценки total / count (0, если отзывов нет)."""
+    return Coalesce(
+        Cast(total, FloatField()) / NullIf(count, 0),
+        Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def recalculate_ratings(titles=None):
+    """
+    Пересчитывает сохранённые суммы, количество, гистограмму
+    и среднюю оценку произведений по таблице отзывов.
+    Возвращает число обновлённых строк.
+    """
+    if titles is None:
+        titles = Title.objects.all()
+    scores = (
+        Review.objects.filter(title=OuterRef("pk")).order_by().values("title")
+    )
+
+    def aggregate(queryset, function):
+        return Coalesce(
+            Subquery(
+                queryset.annotate(total=function).values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+
+    # Подзапросы отбирают отзывы только по title_id: с условием на оценку
+    # SQLite выбирает индекс по score и просматривает все отзывы с ней.
+    updated = titles.update(
+        rating_sum=aggregate(scores, Sum("score")),
+        rating_count=aggregate(scores, Count("pk")),
+        **{
+            score_column(score): aggregate(
+                scores, Count("pk", filter=Q(score=score))
+            )
+            for score in SCORES
+        },
+    )
+    titles.update(
+        rating_mean=mean_expression(F("rating_sum"), F("rating_count"))
+    )
+    return updated
+
+
+def rating_stats(title_id):
+    """
+    Гистограмма оценок, средняя оценка и число отзывов произведения
+    из сохранённых счётчиков (одна строка) или None, если его нет.
+    """
+    row = (
+        Title.objects.filter(pk=title_id)
+        .values("rating_sum", "rating_count", *HISTOGRAM_COLUMNS)
+        .first()
+    )
+    if row is None:
+        return None
+    count = row["rating_count"]
+    return {
+        "scores": {str(score): row[score_column(score)] for score in SCORES},
+        "mean": round(row["rating_sum"] / count, 2) if count else None,
+        "count": count,
+    }
@@ -0,0 +1,97 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from .models import Title, TitleSearchIndex
+
+FTS_TABLE = TitleSearchIndex._meta.db_table
+TITLE_TABLE = Title._meta.db_table
+TOKEN_RE = re.compile(r"\w+")
+
+
+def is_enabled(using="default"):
+    """Полнотекстовый индекс FTS5 поддерживается только на SQLite."""
+    return connections[using].vendor == "sqlite"
+
+
+def build_query(text):
+    """
+    Превращает пользовательский ввод в безопасный запрос FTS5:
+    каждое слово ищется по префиксу, все слова обязательны.
+    """
+    return " ".join(f'"{token}"*' for token in TOKEN_RE.findall(text))
+
+
+def index_title(title, using="default"):
+    if not is_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [title.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+            "VALUES (%s, %s, %s)",
+            [title.pk, title.name, title.description],
+        )
+
+
+def index_titles(pks, using="default"):
+    """Переиндексирует пачку произведений двумя запросами."""
+    if not is_enabled(using) or not pks:
+        return
+    pks = list(pks)
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", pks
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+            f"SELECT id, name, description FROM {TITLE_TABLE} "
+            f"WHERE id IN ({placeholders})",
+            pks,
+        )
+
+
+def unindex_title(pk, using="default"):
+    if not is_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_index(using="default"):
+    """Заново наполняет индекс из таблицы произведений."""
+    if not is_enabled(using):
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+            f"SELECT id, name, description FROM {TITLE_TABLE}"
+        )
+        count = cursor.rowcount
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"
+        )
+    return count
+
+
+def search_titles(queryset, text):
+    """
+    Фильтрует произведения по словам из text и упорядочивает
+    по релевантности (bm25). Вне SQLite выполняет поиск icontains.
+    """
+    query = build_query(text)
+    if not query:
+        return queryset.none()
+    if not is_enabled(queryset.db):
+        condition = Q()
+        for token in TOKEN_RE.findall(text):
+            condition &= Q(name__icontains=token) | Q(
+                description__icontains=token
+            )
+        return queryset.filter(condition)
+    return queryset.filter(search_index__document__match=query).order_by(
+        "search_index__rank"
+    )
@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import catalog, search
+from .models import SCORES, Category, Genre, Review, Title, score_column
+from .ratings import mean_expression, recalculate_ratings
+
+
+def change_rating(title_id, added=None, removed=None):
+    """
+    Атомарно учитывает добавленную и (или) убранную оценку в сумме,
+    количестве, средней и гистограмме оценок произведения одним UPDATE.
+    """
+    total = count = 0
+    histogram = {}
+    for score, sign in ((added, 1), (removed, -1)):
+        if score is None:
+            continue
+        total += sign * score
+        count += sign
+        if score in SCORES:
+            column = score_column(score)
+            histogram[column] = histogram.get(column, F(column)) + sign
+    # В SET все выражения видят значения строки до обновления.
+    new_sum = F("rating_sum") + total
+    new_count = F("rating_count") + count
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating_mean=mean_expression(new_sum, new_count),
+        **histogram,
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """Поддерживает рейтинг произведения при создании и правке отзыва."""
+    if raw:
+        return
+    if created:
+        change_rating(instance.title_id, added=instance.score)
+    else:
+        old_title_id, old_score = getattr(
+            instance, "_loaded_rating", (None, None)
+        )
+        if old_title_id is None or old_score is None:
+            recalculate_ratings(Title.objects.filter(pk=instance.title_id))
+        elif old_title_id != instance.title_id:
+            change_rating(old_title_id, removed=old_score)
+            change_rating(instance.title_id, added=instance.score)
+        elif old_score != instance.score:
+            change_rating(
+                instance.title_id, added=instance.score, removed=old_score
+            )
+    instance._loaded_rating = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Вычитает оценку удалённого отзыва из рейтинга произведения."""
+    change_rating(instance.title_id, removed=instance.score)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, using, **kwargs):
+    """Синхронизирует полнотекстовый индекс с произведением."""
+    search.index_title(instance, using)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, using, **kwargs):
+    search.unindex_title(instance.pk, using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    transaction.on_commit(catalog.categories.invalidate)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    transaction.on_commit(catalog.genres.invalidate)
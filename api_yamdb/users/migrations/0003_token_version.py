@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_auto_20230403_2308"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="token_version",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Версия токенов"
+            ),
+        ),
+    ]
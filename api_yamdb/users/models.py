@@ -20,6 +20,8 @@ class User(AbstractUser):
     USER = "user"
     MODERATOR = "moderator"
     ADMIN = "admin"
+    # Поля, от которых зависят права: их изменение отзывает токены.
+    ACCESS_FIELDS = ("role", "is_staff", "is_active")
 
     username = models.CharField(
         ("username"),
@@ -63,6 +65,11 @@ class User(AbstractUser):
         editable=False,
         unique=True,
     )
+    token_version = models.PositiveIntegerField(
+        "Версия токенов",
+        default=0,
+        editable=False,
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username", "password"]
@@ -86,3 +93,37 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Имя встроено в отзывы и комментарии: его смена меняет версию
+        # их коллекций (core.signals.user_changed).
+        instance._loaded_username = instance.__dict__.get("username")
+        if set(cls.ACCESS_FIELDS).issubset(field_names):
+            instance._loaded_access = instance.access
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        if fields is None or "username" in fields:
+            self._loaded_username = self.username
+        if fields is None or set(self.ACCESS_FIELDS).issubset(fields):
+            self._loaded_access = self.access
+
+    @property
+    def access(self):
+        return tuple(getattr(self, field) for field in self.ACCESS_FIELDS)
+
+    def save(self, *args, **kwargs):
+        # Роль и флаги встроены в выданные access-токены: при их смене
+        # новая версия делает прежние токены недействительными.
+        loaded = getattr(self, "_loaded_access", None)
+        if loaded is not None and loaded != self.access:
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_username = self.username
+        self._loaded_access = self.access
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import User
+
+# Утверждения о пользователе в access-токене. Права API проверяет
+# по role и is_staff без запроса к БД (api.authentication.TokenUser).
+CLAIMS = ("username", "role", "is_staff")
+VERSION_CLAIM = "token_version"
+
+
+def version_key(user_id):
+    return f"token_version:{user_id}"
+
+
+def get_token_version(user_id):
+    """
+    Текущая версия токенов пользователя: из кэша, при промахе — из БД.
+    None, если пользователя нет или он не активен.
+    """
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            User.objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            # add не перезапишет версию, которую уже положило сохранение
+            # пользователя, значением, прочитанным до него.
+            cache.add(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def remember_token_version(user_id, version):
+    cache.set(
+        version_key(user_id), version, settings.TOKEN_VERSION_CACHE_TIMEOUT
+    )
+
+
+def forget_token_version(user_id):
+    cache.delete(version_key(user_id))
+
+
+def access_token_for(user):
+    """Access-токен с ролью, флагами и версией токенов пользователя."""
+    token = AccessToken.for_user(user)
+    for claim in CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[VERSION_CLAIM] = user.token_version
+    remember_token_version(user.pk, user.token_version)
+    return token
@@ -0,0 +1,417 @@
+"""
+Бенчмарк всех маршрутов /api/v1 на сгенерированных данных.
+
+Для каждого маршрута и метода из api/urls.py замеряет p50/p95/p99,
+запросы в секунду и число SQL-запросов, результат пишет в JSON.
+Изменяющие запросы выполняются над свежими объектами, созданными
+до замера. Файлы двух коммитов можно сравнить через --compare.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_api.py --output bench_output.json
+    python benchmarks/bench_api.py --compare old.json --output new.json
+"""
+import argparse
+import json
+import logging
+import subprocess
+import time
+from io import StringIO
+from functools import partial
+from itertools import count
+
+from utils import BASE_DIR, measure, setup_django, summary
+
+DATASET = {
+    "users": 2000,
+    "categories": 5,
+    "genres": 30,
+    "titles": 2000,
+    "reviews": 40000,
+    "comments": 40000,
+}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def iter_routes(patterns):
+    """Обходит маршруты api/urls.py, пропуская варианты с ?format."""
+    from django.urls import URLResolver
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns)
+        elif "format" not in pattern.pattern.regex.groupindex:
+            yield pattern
+
+
+def route_methods(pattern):
+    """Методы маршрута, которые view действительно обрабатывает."""
+    view_class = getattr(pattern.callback, "cls", None) or getattr(
+        pattern.callback, "view_class", None
+    )
+    actions = getattr(pattern.callback, "actions", None)
+    if actions is None:
+        actions = {method: method for method in ("get", "post")}
+    return {
+        method
+        for method, action in actions.items()
+        if hasattr(view_class, action)
+        and method in view_class.http_method_names
+    }
+
+
+def sample_objects():
+    """Самые «тяжёлые» объекты набора данных для detail-маршрутов."""
+    from django.db.models import Count
+
+    from reviews.models import Category, Genre, Review, Title
+    from users.models import User
+
+    title = Title.objects.order_by("-rating_count").first()
+    review = (
+        Review.objects.filter(title=title)
+        .annotate(total=Count("comments"))
+        .order_by("-total")
+        .first()
+    )
+    return {
+        "title": title,
+        "review": review,
+        "comment": review.comments.first(),
+        "genres": Genre.objects.first(),
+        "categories": Category.objects.first(),
+        "user": User.objects.exclude(username="bench_admin").first(),
+    }
+
+
+def route_kwargs(pattern, objects):
+    prefix = pattern.name.split("-")[0]
+    values = {
+        "title_id": objects["title"].pk,
+        "review_id": objects["review"].pk,
+        "username": objects["user"].username,
+        "pk": {
+            "titles": objects["title"].pk,
+            "reviews": objects["review"].pk,
+            "comments": objects["comment"].pk,
+        }.get(prefix),
+        "slug": getattr(objects.get(prefix), "slug", None),
+    }
+    return {name: values[name] for name in pattern.pattern.regex.groupindex}
+
+
+class Fixtures:
+    """Свежие объекты для изменяющих запросов: по одному на вызов."""
+
+    def __init__(self, admin, objects):
+        self.admin = admin
+        self.objects = objects
+        self.numbers = count()
+
+    def number(self):
+        return next(self.numbers)
+
+    def slug_object(self, model):
+        number = self.number()
+        obj = model.objects.create(
+            name=f"Бенчмарк {number}", slug=f"bench_{number}"
+        )
+        return {"slug": obj.slug}
+
+    def genres(self):
+        from reviews.models import Genre
+
+        return self.slug_object(Genre)
+
+    def categories(self):
+        from reviews.models import Category
+
+        return self.slug_object(Category)
+
+    def titles(self):
+        from reviews.models import Title
+
+        title = Title.objects.create(
+            name=f"Бенчмарк {self.number()}",
+            year=2000,
+            category=self.objects["categories"],
+        )
+        return {"pk": title.pk, "title_id": title.pk}
+
+    def user(self):
+        from users.models import User
+
+        number = self.number()
+        user = User.objects.create(
+            username=f"bench_{number}", email=f"bench_{number}@yamdb.fake"
+        )
+        return {"username": user.username, "user": user}
+
+    def reviews(self):
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=self.objects["title"],
+            author=self.user()["user"],
+            text="Отзыв для бенчмарка",
+            score=5,
+        )
+        return {"title_id": review.title_id, "pk": review.pk}
+
+    def comments(self):
+        from reviews.models import Comment
+
+        comment = Comment.objects.create(
+            review=self.objects["review"],
+            author=self.admin,
+            text="Комментарий для бенчмарка",
+        )
+        return {
+            "title_id": self.objects["title"].pk,
+            "review_id": comment.review_id,
+            "pk": comment.pk,
+        }
+
+    def payload(self, name):
+        """Данные POST в list-маршрут или PUT/PATCH объекта."""
+        number = self.number()
+        return {
+            "genres": {"name": f"Жанр {number}", "slug": f"g_{number}"},
+            "categories": {
+                "name": f"Категория {number}",
+                "slug": f"c_{number}",
+            },
+            "titles": {
+                "name": f"Произведение {number}",
+                "year": 2000,
+                "category": self.objects["categories"].slug,
+                "genre": [self.objects["genres"].slug],
+            },
+            "reviews": {"text": f"Отзыв {number}", "score": 7},
+            "comments": {"text": f"Комментарий {number}"},
+            "user": {
+                "username": f"new_{number}",
+                "email": f"new_{number}@yamdb.fake",
+                "bio": f"Биография {number}",
+            },
+        }[name]
+
+
+def fixed_case(url, data=None):
+    return lambda: (url, data)
+
+
+def object_case(name, kwargs, make_object, make_data=None):
+    """Каждый вызов — над новым объектом из make_object."""
+    from django.urls import reverse
+
+    def prepare():
+        fresh = make_object()
+        url = reverse(
+            name,
+            kwargs={
+                key: fresh.get(key, value) for key, value in kwargs.items()
+            },
+        )
+        return url, make_data() if make_data else None
+
+    return prepare
+
+
+def build_cases(admin, objects):
+    """
+    Возвращает список (ключ, метод, prepare) для всех маршрутов
+    и методов; prepare() возвращает (url, данные) очередного вызова.
+    Маршрут без сценария — ошибка, а не молчаливый пропуск.
+    """
+    from django.urls import reverse
+
+    from api.urls import urlpatterns
+
+    fixtures = Fixtures(admin, objects)
+    special = {
+        ("sign-up-list", "post"): fixed_case(
+            reverse("sign-up-list"),
+            {
+                "username": objects["user"].username,
+                "email": objects["user"].email,
+            },
+        ),
+        ("get_token", "post"): fixed_case(
+            reverse("get_token"),
+            {
+                "username": admin.username,
+                "confirmation_code": str(admin.confirmation_code),
+            },
+        ),
+        ("user-me", "patch"): fixed_case(
+            reverse("user-me"), {"bio": "Биография бенчмарка"}
+        ),
+        # Автор оставляет один отзыв на произведение: каждый раз новое.
+        ("reviews-list", "post"): object_case(
+            "reviews-list",
+            {"title_id": objects["title"].pk},
+            fixtures.titles,
+            lambda: fixtures.payload("reviews"),
+        ),
+        ("titles-bulk", "post"): lambda: (
+            reverse("titles-bulk"),
+            [fixtures.payload("titles") for _ in range(10)],
+        ),
+    }
+    cases, missing = [], []
+    for pattern in iter_routes(urlpatterns):
+        name = pattern.name
+        prefix = name.split("-")[0]
+        kwargs = route_kwargs(pattern, objects)
+        make_object = getattr(fixtures, prefix, None)
+        for method in sorted(route_methods(pattern)):
+            key = f"{method.upper()} {name}"
+            if (name, method) in special:
+                prepare = special[name, method]
+            elif method == "get":
+                prepare = fixed_case(reverse(name, kwargs=kwargs))
+            elif method == "post" and name.endswith("-list"):
+                prepare = partial(
+                    lambda url, prefix: (url, fixtures.payload(prefix)),
+                    reverse(name, kwargs=kwargs),
+                    prefix,
+                )
+            elif method == "delete" and make_object:
+                prepare = object_case(name, kwargs, make_object)
+            elif method in ("put", "patch") and make_object:
+                prepare = object_case(
+                    name,
+                    kwargs,
+                    make_object,
+                    partial(fixtures.payload, prefix),
+                )
+            else:
+                missing.append(key)
+                continue
+            cases.append((key, method, prepare))
+    if missing:
+        raise RuntimeError(
+            "Нет сценария бенчмарка для маршрутов: " + ", ".join(missing)
+        )
+    return cases
+
+
+def run_case(client, method, prepare, repeat, warmup=2):
+    from django.db import connection
+
+    queries = []
+    # Объекты для изменяющих запросов создаются до замера.
+    calls = iter([prepare() for _ in range(repeat + warmup + 1)])
+
+    def count_queries(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def call():
+        url, data = next(calls)
+        if method == "get":
+            response = client.get(url, data)
+        else:
+            response = getattr(client, method)(url, data, format="json")
+        assert response.status_code < 500, (url, response.status_code)
+        if response.streaming:
+            # Потоковый ответ формируется при чтении: без него замер
+            # и счётчик запросов не учитывают выгрузку.
+            b"".join(response.streaming_content)
+        return response, url
+
+    with connection.execute_wrapper(count_queries):
+        response, url = call()
+    status = response.status_code
+    started = time.perf_counter()
+    timings = measure(call, repeat=repeat, warmup=warmup)
+    elapsed = time.perf_counter() - started
+    result = summary(timings)
+    result["rps"] = round(repeat / elapsed, 1)
+    result["queries"] = len(queries)
+    result["url"] = url
+    result["status"] = status
+    return result
+
+
+def compare(old, new):
+    print(
+        f"{'endpoint':32} {'p50 old':>9} {'p50 new':>9} {'diff':>7} "
+        f"{'queries':>9}"
+    )
+    for key, result in new["endpoints"].items():
+        before = old["endpoints"].get(key)
+        if before is None:
+            continue
+        diff = (result["p50_ms"] / before["p50_ms"] - 1) * 100
+        queries = f"{before['queries']}->{result['queries']}"
+        print(
+            f"{key:32} {before['p50_ms']:9.2f} {result['p50_ms']:9.2f} "
+            f"{diff:+6.0f}% {queries:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Куда записать JSON с результатом.")
+    parser.add_argument("--compare", help="JSON предыдущего запуска.")
+    for name, default in DATASET.items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    args = parser.parse_args()
+
+    setup_django()
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from users.models import User
+
+    dataset = {name: getattr(args, name) for name in DATASET}
+    call_command("generate_data", seed=args.seed, stdout=StringIO(), **dataset)
+    admin = User.objects.create_user(
+        username="bench_admin", email="bench_admin@yamdb.fake", role="admin"
+    )
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}"
+    )
+
+    cases = build_cases(admin, sample_objects())
+    report = {
+        "revision": git_revision(),
+        "dataset": dataset,
+        "repeat": args.repeat,
+        "endpoints": {},
+    }
+    for key, method, prepare in cases:
+        report["endpoints"][key] = run_case(
+            client, method, prepare, args.repeat
+        )
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(json.load(file), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Аутентификация по JWT: число SQL-запросов к таблице пользователей
+и время ответа POST /api/v1/categories/ от администратора с токеном
+без утверждений (пользователь загружается из БД) и с токеном
+из /api/v1/auth/token/ (права берутся из утверждений).
+
+Запуск из корня репозитория:
+    python benchmarks/bench_jwt_auth.py
+"""
+import argparse
+import json
+from itertools import count
+
+from utils import measure, setup_django, summary
+
+URL = "/api/v1/categories/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from users import tokens
+    from users.models import User
+
+    admin = User.objects.create(
+        username="bench_admin", email="admin@yamdb.fake", role=User.ADMIN
+    )
+    cases = {
+        "plain": AccessToken.for_user(admin),
+        "claims": tokens.access_token_for(admin),
+    }
+    numbers = count()
+    results = {}
+    for name, token in cases.items():
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        def request():
+            number = next(numbers)
+            response = client.post(
+                URL, {"name": f"Категория {number}", "slug": f"c{number}"}
+            )
+            assert response.status_code == 201, response.content
+
+        request()
+        with CaptureQueriesContext(connection) as context:
+            request()
+        results[name] = {
+            "user_queries": sum(
+                "users_user" in query["sql"]
+                for query in context.captured_queries
+            ),
+            **summary(measure(request, repeat=args.repeat)),
+        }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
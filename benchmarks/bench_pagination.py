@@ -0,0 +1,85 @@
+"""
+Сравнение постраничной и keyset-пагинации отзывов.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_pagination.py --reviews 50000
+"""
+import argparse
+import json
+from base64 import b64encode
+
+from utils import measure, setup_django, summary
+
+
+def seed(reviews_count):
+    from django.utils import timezone
+
+    from reviews.models import Category, Review, Title
+    from users.models import User
+
+    category = Category.objects.create(name="Фильм", slug="movie")
+    title = Title.objects.create(name="Бенчмарк", year=2000, category=category)
+    User.objects.bulk_create(
+        User(username=f"user{i}", email=f"user{i}@yamdb.fake")
+        for i in range(reviews_count)
+    )
+    now = timezone.now()
+    Review.objects.bulk_create(
+        (
+            Review(
+                title=title,
+                author_id=author_id,
+                text="Текст отзыва",
+                score=author_id % 10 + 1,
+                pub_date=now,
+            )
+            for author_id in User.objects.values_list("id", flat=True)
+        ),
+        batch_size=5000,
+    )
+    return title
+
+
+def keyset_cursor(review):
+    raw = f"0|{review.pub_date.isoformat()}|{review.pk}"
+    return b64encode(raw.encode("ascii")).decode("ascii")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=50000)
+    parser.add_argument("--page", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from rest_framework.test import APIClient
+
+    title = seed(args.reviews)
+    client = APIClient()
+    url = f"/api/v1/titles/{title.id}/reviews/"
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    deep = title.reviews.order_by("-pub_date", "-id")[
+        (args.page - 1) * page_size - 1
+    ]
+
+    cases = {
+        "page_number:1": {},
+        f"page_number:{args.page}": {"page": args.page},
+        "keyset:1": {"pagination": "cursor"},
+        f"keyset:{args.page}": {"cursor": keyset_cursor(deep)},
+    }
+    results = {}
+    for name, params in cases.items():
+        response = client.get(url, params)
+        assert response.status_code == 200, (name, response.status_code)
+        results[name] = summary(
+            measure(lambda: client.get(url, params), repeat=args.repeat)
+        )
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
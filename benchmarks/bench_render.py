@@ -0,0 +1,107 @@
+"""
+Процессорное время сериализации и рендеринга одной страницы списка:
+стандартные ModelSerializer + JSONRenderer против скомпилированного
+to_representation + FastJSONRenderer (orjson, если установлен).
+Запросы к базе выполняются заранее и в замер не входят.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_render.py --page-size 100
+"""
+import argparse
+import json
+import time
+from io import StringIO
+
+from utils import measure, setup_django, summary
+
+
+def pages(page_size):
+    from django.db.models import Count, Prefetch
+
+    from reviews.models import Comment, Review, Title
+
+    titles = list(Title.objects.prefetch_related("genre")[:page_size])
+    review = (
+        Review.objects.annotate(total=Count("comments"))
+        .order_by("-total")
+        .first()
+    )
+    reviews = list(
+        Review.objects.filter(title=review.title_id)
+        .select_related("author")
+        .prefetch_related(
+            Prefetch(
+                "comments",
+                queryset=Comment.objects.select_related("author"),
+            )
+        )[:page_size]
+    )
+    comments = list(review.comments.select_related("author")[:page_size])
+    return titles, reviews, comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import FastJSONRenderer, orjson
+    from api.serializers import (
+        CommentSerializer,
+        CompiledRepresentationMixin,
+        ReviewSerializer,
+        TitleOnlyReadSerializer,
+    )
+
+    call_command(
+        "generate_data",
+        users=2000,
+        categories=10,
+        genres=30,
+        titles=2000,
+        reviews=20000,
+        comments=20000,
+        seed=args.seed,
+        stdout=StringIO(),
+    )
+    titles, reviews, comments = pages(args.page_size)
+    cases = {
+        "titles": (TitleOnlyReadSerializer, titles),
+        "reviews": (ReviewSerializer, reviews),
+        "comments": (CommentSerializer, comments),
+    }
+    modes = {
+        "before": (False, JSONRenderer()),
+        "after": (True, FastJSONRenderer()),
+    }
+    results = {"orjson": orjson is not None, "page_size": args.page_size}
+    for name, (serializer_class, objects) in cases.items():
+        results[name] = {}
+        for mode, (compiled, renderer) in modes.items():
+            CompiledRepresentationMixin.compiled_representation = compiled
+
+            def render():
+                data = serializer_class(objects, many=True).data
+                return renderer.render(data)
+
+            results[name][mode] = summary(
+                measure(render, repeat=args.repeat, clock=time.process_time)
+            )
+        results[name]["speedup"] = round(
+            results[name]["before"]["mean_ms"]
+            / results[name]["after"]["mean_ms"],
+            2,
+        )
+        CompiledRepresentationMixin.compiled_representation = True
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Сравнение поиска произведений через FTS5 и через icontains.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_search.py --titles 100000
+"""
+import argparse
+import json
+import random
+
+from utils import measure, setup_django, summary
+
+SYLLABLES = (
+    "ба ве го ди жу зо ка ле ми но пу ра со ту фе ха це чи шу эр".split()
+)
+
+
+def make_vocabulary(rnd, size=5000):
+    return [
+        "".join(rnd.choices(SYLLABLES, k=rnd.randint(2, 4)))
+        for _ in range(size)
+    ]
+
+
+def seed(titles_count, words, rnd):
+    from reviews.models import Category, Title
+    from reviews.search import rebuild_index
+
+    category = Category.objects.create(name="Фильм", slug="movie")
+    Title.objects.bulk_create(
+        (
+            Title(
+                name=" ".join(rnd.choices(words, k=3)).capitalize(),
+                description=" ".join(rnd.choices(words, k=40)),
+                year=rnd.randint(1900, 2020),
+                category=category,
+            )
+            for _ in range(titles_count)
+        ),
+        batch_size=5000,
+    )
+    rebuild_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db.models import Q
+
+    from reviews.models import Title
+    from reviews.search import search_titles
+
+    rnd = random.Random(args.seed)
+    words = make_vocabulary(rnd)
+    seed(args.titles, words, rnd)
+    queryset = Title.objects.all()
+    results = {}
+    for text in (words[0], f"{words[1]} {words[2]}", words[3][:4]):
+
+        def fts():
+            found = search_titles(queryset, text)
+            return found.count(), list(found[:10])
+
+        def icontains():
+            condition = Q()
+            for token in text.split():
+                condition &= Q(name__icontains=token) | Q(
+                    description__icontains=token
+                )
+            found = queryset.filter(condition)
+            return found.count(), list(found[:10])
+
+        results[text] = {
+            "fts5": summary(measure(fts, repeat=args.repeat)),
+            "icontains": summary(measure(icontains, repeat=args.repeat)),
+        }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Регистрация через POST /api/v1/auth/signup/: число SQL-запросов
+и время ответа для нового пользователя, повторной регистрации
+и конфликта username/email на таблице пользователей заданного размера.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_signup.py --users 50000
+"""
+import argparse
+import json
+import logging
+from io import StringIO
+from itertools import count
+
+from utils import measure, setup_django, summary
+
+URL = "/api/v1/auth/signup/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    logging.getLogger("core.db").setLevel(logging.ERROR)
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    from users.models import User
+
+    call_command(
+        "generate_data",
+        users=args.users,
+        categories=1,
+        genres=1,
+        titles=0,
+        reviews=0,
+        comments=0,
+        stdout=StringIO(),
+    )
+    client = Client()
+    existing = User.objects.order_by("pk").values("username", "email")[0]
+    numbers = count()
+
+    def new_user():
+        number = next(numbers)
+        return {"username": f"bench{number}", "email": f"b{number}@ya.fake"}
+
+    cases = {
+        "new": (new_user, 200),
+        "existing": (lambda: existing, 200),
+        "conflict": (
+            lambda: {**existing, "email": "other@yamdb.fake"},
+            400,
+        ),
+    }
+    results = {"users": User.objects.count()}
+    for name, (make_data, expected) in cases.items():
+
+        def request():
+            response = client.post(URL, make_data())
+            assert response.status_code == expected, response.content
+
+        with CaptureQueriesContext(connection) as context:
+            request()
+        results[name] = {
+            "queries": len(
+                [
+                    query
+                    for query in context.captured_queries
+                    if query["sql"] != "BEGIN"
+                ]
+            ),
+            **summary(measure(request, repeat=args.repeat)),
+        }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
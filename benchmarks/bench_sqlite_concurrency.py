@@ -0,0 +1,154 @@
+"""
+Смешанная нагрузка на файловую базу SQLite: потоки-читатели листают
+отзывы произведений, потоки-писатели добавляют комментарии и меняют
+оценки (с пересчётом рейтинга и версий коллекций). Один и тот же
+прогон выполняется с PRAGMA SQLite по умолчанию (rollback journal,
+synchronous=FULL) и с settings.SQLITE_PRAGMAS (WAL и т. д.);
+для каждого режима выводятся операции в секунду, задержки и число
+ошибок «database is locked».
+
+Запуск из корня репозитория:
+    python benchmarks/bench_sqlite_concurrency.py --readers 4 --writers 2
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from io import StringIO
+
+from utils import setup_django, summary
+
+# Режим «до»: значения SQLite по умолчанию. journal_mode хранится
+# в файле базы, поэтому его нужно вернуть явно.
+DEFAULT_PRAGMAS = {"journal_mode": "delete", "synchronous": "full"}
+
+
+def run_workers(roles, duration):
+    """Запускает потоки ролей на duration секунд, возвращает статистику."""
+    from django.db import OperationalError, connection
+
+    stop = threading.Event()
+    results = {name: [] for name in roles}
+
+    def worker(name, operation, seed):
+        rng = random.Random(seed)
+        timings, errors = [], 0
+        try:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    operation(rng)
+                except OperationalError:
+                    errors += 1
+                    continue
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection.close()
+            results[name].append((timings, errors))
+
+    threads = [
+        threading.Thread(target=worker, args=(name, operation, index))
+        for name, (operation, count) in roles.items()
+        for index in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    stats = {}
+    for name, runs in results.items():
+        timings = [timing for run, _ in runs for timing in run]
+        stats[name] = {
+            "ops_per_sec": round(len(timings) / duration, 1),
+            "errors": sum(errors for _, errors in runs),
+            **(summary(timings) if timings else {}),
+        }
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(os.path.join(directory, "bench.sqlite3"))
+
+        from django.conf import settings
+        from django.core.management import call_command
+        from django.db import connection, connections, transaction
+
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        call_command(
+            "generate_data",
+            users=1000,
+            categories=5,
+            genres=20,
+            titles=500,
+            reviews=10000,
+            comments=10000,
+            seed=args.seed,
+            stdout=StringIO(),
+        )
+        title_ids = list(Title.objects.values_list("pk", flat=True))
+        review_ids = list(Review.objects.values_list("pk", flat=True))
+        user_ids = list(User.objects.values_list("pk", flat=True))
+
+        def read(rng):
+            list(
+                Review.objects.filter(title_id=rng.choice(title_ids))
+                .order_by("-pub_date", "-id")
+                .values("id", "text", "score", "author__username")[:20]
+            )
+
+        def write(rng):
+            # Как во вьюсетах: объект читается до транзакции записи.
+            # Транзакция SQLite, начатая чтением, не может дождаться
+            # блокировки записи и сразу получает «database is locked».
+            if rng.random() < 0.5:
+                with transaction.atomic():
+                    Comment.objects.create(
+                        review_id=rng.choice(review_ids),
+                        author_id=rng.choice(user_ids),
+                        text="Комментарий нагрузочного теста",
+                    )
+            else:
+                review = Review.objects.get(pk=rng.choice(review_ids))
+                review.score = rng.randint(1, 10)
+                with transaction.atomic():
+                    review.save(update_fields=["score"])
+
+        roles = {"read": (read, args.readers), "write": (write, args.writers)}
+        tuned = settings.SQLITE_PRAGMAS
+        results = {
+            "readers": args.readers,
+            "writers": args.writers,
+            "duration_s": args.duration,
+        }
+        for mode, pragmas in (("default", DEFAULT_PRAGMAS), ("tuned", tuned)):
+            settings.SQLITE_PRAGMAS = pragmas
+            connections.close_all()
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                journal_mode = cursor.fetchone()[0]
+            results[mode] = {
+                "journal_mode": journal_mode,
+                **run_workers(roles, args.duration),
+            }
+        connections.close_all()
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
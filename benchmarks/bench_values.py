@@ -0,0 +1,115 @@
+"""
+Чтение страницы списка: модели и сериализатор против values()
+и сборки ответа из строк (api.readers). Замеряются процессорное
+время (вместе с запросами к базе) и пик памяти по tracemalloc.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_values.py --page-size 500
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from io import StringIO
+
+from utils import measure, setup_django, summary
+
+
+def peak_memory_kb(func):
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from django.db.models import Count, Prefetch
+
+    from api.readers import CommentReader, ReviewReader, TitleReader
+    from api.serializers import (
+        CommentSerializer,
+        ReviewSerializer,
+        TitleOnlyReadSerializer,
+    )
+    from reviews.models import Comment, Review, Title
+
+    call_command(
+        "generate_data",
+        users=5000,
+        categories=10,
+        genres=30,
+        titles=5000,
+        reviews=50000,
+        comments=50000,
+        seed=args.seed,
+        stdout=StringIO(),
+    )
+    size = args.page_size
+    title_id = (
+        Title.objects.annotate(total=Count("reviews"))
+        .order_by("-total")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    review_id = (
+        Review.objects.annotate(total=Count("comments"))
+        .order_by("-total")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    titles = Title.objects.prefetch_related("genre")
+    reviews = (
+        Review.objects.filter(title=title_id)
+        .select_related("author")
+        .prefetch_related(
+            Prefetch(
+                "comments",
+                queryset=Comment.objects.select_related("author"),
+            )
+        )
+    )
+    comments = Comment.objects.filter(review=review_id).select_related(
+        "author"
+    )
+    cases = {
+        "titles": (titles, TitleOnlyReadSerializer, TitleReader()),
+        "reviews": (reviews, ReviewSerializer, ReviewReader()),
+        "comments": (comments, CommentSerializer, CommentReader()),
+    }
+    results = {"page_size": size}
+    for name, (queryset, serializer_class, reader) in cases.items():
+
+        def models():
+            return serializer_class(queryset[:size], many=True).data
+
+        def values():
+            fields = reader.select()
+            return reader.build(
+                list(reader.values(queryset, fields)[:size]), fields
+            )
+
+        results[name] = {
+            mode: {
+                **summary(
+                    measure(func, repeat=args.repeat, clock=time.process_time)
+                ),
+                "peak_kb": peak_memory_kb(func),
+            }
+            for mode, func in (("models", models), ("values", values))
+        }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Общие помощники для бенчмарков: настройка Django и замеры времени."""
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(BASE_DIR, "api_yamdb")
+
+
+def setup_django(test_db_name=None):
+    """
+    Настраивает Django и создаёт временную тестовую базу,
+    чтобы бенчмарки не трогали рабочую db.sqlite3. По умолчанию
+    база SQLite создаётся в памяти, test_db_name задаёт файл.
+    """
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    if test_db_name is not None:
+        connection.settings_dict["TEST"]["NAME"] = test_db_name
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def measure(func, repeat=20, warmup=2, clock=time.perf_counter):
+    """
+    Вызывает func несколько раз и возвращает список длительностей в мс.
+    clock=time.process_time измеряет процессорное время вместо общего.
+    """
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = clock()
+        func()
+        timings.append((clock() - start) * 1000)
+    return timings
+
+
+def percentile(timings, percent):
+    ordered = sorted(timings)
+    return ordered[round(percent / 100 * (len(ordered) - 1))]
+
+
+def summary(timings):
+    return {
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+    }
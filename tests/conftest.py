@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,3 +33,15 @@ assert get_version() < "4.0.0", "Пожалуйста, используйте в
 pytest_plugins = [
     "tests.fixtures.fixture_user",
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """База очищается между тестами, поэтому очищаем и кэши."""
+    from django.core.cache import cache
+
+    from reviews import catalog
+
+    cache.clear()
+    catalog.categories.invalidate()
+    catalog.genres.invalidate()
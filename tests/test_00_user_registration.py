@@ -2,6 +2,7 @@ from http import HTTPStatus
 
 import pytest
 from django.core import mail
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 
 from tests.utils import (invalid_data_for_user_patch_and_creation,
@@ -107,6 +108,11 @@ class Test00UserRegistration:
         }
 
         response = client.post(self.url_signup, data=valid_data)
+        assert len(mail.outbox) == outbox_before_count, (
+            "Письмо с кодом подтверждения должно ставиться в очередь, "
+            "а не отправляться во время запроса."
+        )
+        call_command("send_outbox")
         outbox_after = mail.outbox  # email outbox after user create
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
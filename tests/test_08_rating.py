@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08StoredRating:
+    def test_01_rating_follows_reviews(
+        self, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert admin_client.get(url).json()["rating"] == 5
+
+        response = user_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={"score": 10},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(url).json()["rating"] == 7, (
+            "Проверьте, что сохранённый рейтинг произведения обновляется "
+            "при изменении оценки в отзыве."
+        )
+
+        user_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        )
+        assert admin_client.get(url).json()["rating"] == 5, (
+            "Проверьте, что сохранённый рейтинг произведения обновляется "
+            "при удалении отзыва."
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        assert admin_client.get(url).json()["rating"] is None
+
+    def test_02_recalc_ratings_command(
+        self, admin_client, admin, user_client, user
+    ):
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0)
+
+        call_command("recalc_ratings")
+
+        title = Title.objects.get(pk=titles[0]["id"])
+        assert (title.rating_sum, title.rating_count) == (10, 2), (
+            "Проверьте, что команда `recalc_ratings` пересчитывает "
+            "сохранённый рейтинг по отзывам."
+        )
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09KeysetPagination:
+    def test_01_reviews_cursor_walk(
+        self,
+        monkeypatch,
+        client,
+        admin_client,
+        admin,
+        user_client,
+        user,
+        moderator_client,
+        moderator,
+    ):
+        from api.pagination import KeysetPagination
+
+        monkeypatch.setattr(KeysetPagination, "page_size", 1)
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = client.get(url, {"pagination": "cursor"})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert (
+            "count" not in data
+        ), "Проверьте, что keyset-пагинация не выполняет подсчёт записей."
+        assert data["previous"] is None
+        seen = [item["id"] for item in data["results"]]
+        pages = [data]
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            pages.append(data)
+            seen.extend(item["id"] for item in data["results"])
+        assert seen == [review["id"] for review in reversed(reviews)], (
+            "Проверьте, что переход по ссылкам `next` keyset-пагинации "
+            "возвращает все отзывы от новых к старым без повторов."
+        )
+
+        data = client.get(pages[-1]["previous"]).json()
+        assert data["results"] == pages[-2]["results"], (
+            "Проверьте, что ссылка `previous` keyset-пагинации возвращает "
+            "предыдущую страницу."
+        )
+
+    def test_02_default_mode_unchanged(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        data = client.get(url).json()
+        assert data["count"] == len(comments)
+
+        response = client.get(url, {"cursor": "broken"})
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ReviewCommentsPreview:
+    def test_01_latest_comments(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = client.get(url, {"comments_limit": 1})
+        assert response.status_code == HTTPStatus.OK
+        results = {item["id"]: item for item in response.json()["results"]}
+        review = results[reviews[0]["id"]]
+        assert review["comments_count"] == len(comments), (
+            "Проверьте, что при `comments_limit` в ответе есть поле "
+            "`comments_count` с общим числом комментариев к отзыву."
+        )
+        assert [item["id"] for item in review["comments"]] == [
+            comments[-1]["id"]
+        ], (
+            "Проверьте, что при `comments_limit=N` в отзыв встраиваются "
+            "только N последних комментариев."
+        )
+        assert results[reviews[1]["id"]]["comments"] == []
+        assert results[reviews[1]["id"]]["comments_count"] == 0, (
+            "Проверьте, что у отзыва без комментариев `comments_count` "
+            "равен 0, а не null."
+        )
+
+        response = client.get(url)
+        assert "comments_count" not in response.json()["results"][0]
+
+        response = client.get(url, {"comments_limit": "many"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_comments_batched(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        _, _, titles = create_comments(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        for params in ({}, {"comments_limit": 5}):
+            with CaptureQueriesContext(connection) as context:
+                client.get(url, params)
+            comment_queries = [
+                query
+                for query in context.captured_queries
+                if query["sql"].startswith('SELECT "reviews_comment"')
+            ]
+            assert len(comment_queries) == 1, (
+                "Проверьте, что комментарии всех отзывов страницы "
+                "загружаются одним запросом."
+            )
@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+    url = "/api/v1/titles/"
+
+    def search(self, client, text):
+        response = client.get(self.url, {"search": text})
+        assert response.status_code == HTTPStatus.OK
+        return [item["name"] for item in response.json()["results"]]
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+
+        assert self.search(client, "термин") == [titles[0]["name"]], (
+            f"Проверьте, что `{self.url}?search=` ищет произведения "
+            "по началу слова в названии."
+        )
+        assert self.search(client, "yippie") == [titles[1]["name"]], (
+            f"Проверьте, что `{self.url}?search=` ищет произведения "
+            "по описанию."
+        )
+        assert self.search(client, 'back" (') == [titles[0]["name"]]
+
+        admin_client.patch(
+            f'{self.url}{titles[0]["id"]}/', data={"name": "Чужой"}
+        )
+        assert (
+            self.search(client, "термин") == []
+        ), "Проверьте, что индекс обновляется при изменении произведения."
+        admin_client.delete(f'{self.url}{titles[1]["id"]}/')
+        assert self.search(client, "yippie") == []
+
+    def test_02_rebuild_search_index(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        Title.objects.filter(pk=titles[1]["id"]).update(name="Титаник")
+
+        call_command("rebuild_search_index")
+
+        assert self.search(client, "титаник") == ["Титаник"], (
+            "Проверьте, что команда `rebuild_search_index` заново "
+            "наполняет полнотекстовый индекс."
+        )
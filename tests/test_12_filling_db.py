@@ -0,0 +1,80 @@
+import pytest
+from django.core.management import call_command
+
+CSV_DATA = {
+    "users.csv": (
+        "id,username,email,role,bio,first_name,last_name\n"
+        "100,bingobongo,bingobongo@yamdb.fake,user,,,\n"
+    ),
+    "category.csv": "id,name,slug\n1,Фильм,movie\n",
+    "genre.csv": "id,name,slug\n1,Драма,drama\n",
+    "titles.csv": (
+        "id,description,name,year,category_id\n"
+        "1,Описание,Побег из Шоушенка,1994,1\n"
+    ),
+    "genre_title.csv": "id,title_id,genre_id\n1,1,1\n",
+    "review.csv": (
+        "id,title_id,text,author_id,score,pub_date\n"
+        '1,1,"Ставлю десять звёзд!",100,10,2019-09-24T21:08:21.567Z\n'
+    ),
+    "comments.csv": (
+        "id,review_id,text,author_id,pub_date\n"
+        "1,1,Согласен,100,2020-01-13T23:20:02.422Z\n"
+    ),
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12FillingDb:
+    def test_01_load_is_idempotent(self, tmp_path, client):
+        from reviews.models import Comment, Review, Title
+
+        for name, content in CSV_DATA.items():
+            (tmp_path / name).write_text(content, encoding="utf-8")
+
+        call_command("filling_db", path=str(tmp_path), batch_size=1)
+        (tmp_path / "titles.csv").write_text(
+            CSV_DATA["titles.csv"].replace("Описание", "Новое описание"),
+            encoding="utf-8",
+        )
+        call_command("filling_db", path=str(tmp_path))
+
+        assert Title.objects.count() == 1, (
+            "Проверьте, что повторный запуск `filling_db` не дублирует "
+            "строки."
+        )
+        title = Title.objects.get(pk=1)
+        assert title.description == "Новое описание", (
+            "Проверьте, что повторный запуск `filling_db` обновляет "
+            "существующие строки."
+        )
+        assert list(title.genre.values_list("slug", flat=True)) == ["drama"]
+        assert title.rating == 10
+        review = Review.objects.get(pk=1)
+        assert (
+            review.pub_date.year == 2019
+        ), "Проверьте, что `filling_db` сохраняет даты из CSV."
+        assert Comment.objects.get(pk=1).review == review
+
+        data = client.get("/api/v1/titles/", {"search": "шоушенк"}).json()
+        assert [item["id"] for item in data["results"]] == [1]
+
+    def test_02_multirow_insert(self):
+        from core.loader import TableLoader
+        from reviews.models import Genre
+
+        loader = TableLoader(Genre, ["id", "name", "slug"])
+        # Путь для PostgreSQL: многострочный VALUES вместо executemany.
+        loader.multirow = True
+        loader.rows_per_statement = 2
+        rows = [[str(pk), f"Жанр {pk}", f"genre-{pk}"] for pk in range(1, 6)]
+        assert loader.load(rows, batch_size=10) == 5
+        rows[0][1] = "Драма"
+        assert loader.load(rows, batch_size=10) == 5
+        assert list(Genre.objects.order_by("pk").values_list("pk", "name"))[
+            :2
+        ] == [(1, "Драма"), (2, "Жанр 2")], (
+            "Проверьте, что многострочная вставка обновляет существующие "
+            "строки."
+        )
+        assert Genre.objects.count() == 5
@@ -0,0 +1,57 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+OPTIONS = {
+    "users": 30,
+    "categories": 2,
+    "genres": 4,
+    "titles": 10,
+    "reviews": 100,
+    "comments": 50,
+    "seed": 7,
+}
+
+
+def snapshot():
+    from reviews.models import Review
+
+    return list(
+        Review.objects.order_by("id").values_list(
+            "title_id", "author_id", "score", "pub_date"
+        )
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13GenerateData:
+    def test_01_generate_is_deterministic(self):
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        call_command("generate_data", **OPTIONS)
+        assert User.objects.count() == OPTIONS["users"]
+        assert Title.objects.count() == OPTIONS["titles"]
+        assert 0 < Review.objects.count() <= OPTIONS["reviews"]
+        assert 0 < Comment.objects.count() <= OPTIONS["comments"]
+        counts = sorted(
+            Title.objects.values_list("rating_count", flat=True),
+            reverse=True,
+        )
+        assert counts[0] > counts[-1], (
+            "Проверьте, что отзывы распределяются по произведениям "
+            "неравномерно."
+        )
+        first = snapshot()
+
+        Comment.objects.all().delete()
+        Review.objects.all().delete()
+        Title.objects.all().delete()
+        User.objects.all().delete()
+        call_command("generate_data", **OPTIONS)
+        assert snapshot() == first, (
+            "Проверьте, что `generate_data` с одинаковым seed создаёт "
+            "одинаковые данные."
+        )
+
+        with pytest.raises(CommandError):
+            call_command("generate_data", **{**OPTIONS, "categories": 0})
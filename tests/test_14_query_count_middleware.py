@@ -0,0 +1,41 @@
+import json
+import logging
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14QueryCountMiddleware:
+    def test_01_headers_and_log(
+        self, caplog, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        _, _, titles = create_comments(admin_client, author_map)
+
+        with caplog.at_level(logging.INFO, logger="core.db"):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert int(response["X-DB-Queries"]) >= 1, (
+            "Проверьте, что ответ содержит заголовок `X-DB-Queries` "
+            "с числом SQL-запросов."
+        )
+        assert float(response["X-DB-Time"]) >= 0
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["db_queries"] == int(response["X-DB-Queries"])
+        assert record["n_plus_one"] == []
+
+    def test_02_n_plus_one_detection(self, settings):
+        from core.middleware import QueryStats
+
+        settings.DB_SLOWEST_QUERIES = 2
+        stats = QueryStats()
+        sql = "SELECT * FROM reviews_comment WHERE review_id = %s"
+        for review_id in range(5):
+            stats(lambda *args: None, sql, (review_id,), False, {})
+        stats(lambda *args: None, "SELECT 1", (), False, {})
+
+        assert stats.count == 6
+        assert len(stats.slowest) == 2
+        assert stats.n_plus_one(5) == [{"sql": sql, "count": 5}]
+        assert stats.n_plus_one(6) == []
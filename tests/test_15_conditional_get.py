@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
+from reviews.models import Review
+from tests.utils import (
+    create_comments,
+    create_single_comment,
+    create_single_review,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get("ETag")
+        assert etag, f"Проверьте, что ответ на GET `{url}` содержит ETag."
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Проверьте, что GET `{url}` с актуальным If-None-Match "
+            "возвращает 304."
+        )
+        return etag
+
+    def test_01_etag_changes_on_write(
+        self, client, admin_client, admin, user_client, user, moderator_client
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id, review_id = titles[0]["id"], reviews[0]["id"]
+        titles_url = "/api/v1/titles/"
+        reviews_url = f"{titles_url}{title_id}/reviews/"
+        comments_url = f"{reviews_url}{review_id}/comments/"
+
+        titles_etag = self.check_not_modified(client, titles_url)
+        reviews_etag = self.check_not_modified(client, reviews_url)
+        comments_etag = self.check_not_modified(client, comments_url)
+        self.check_not_modified(client, f"{titles_url}{title_id}/")
+
+        create_single_review(moderator_client, title_id, "Новый отзыв", 1)
+        response = client.get(titles_url, HTTP_IF_NONE_MATCH=titles_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что новый отзыв меняет ETag списка произведений "
+            "(меняется рейтинг)."
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        user_client.delete(f"{comments_url}{comments[1]['id']}/")
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что удаление комментария меняет ETag списка "
+            "комментариев."
+        )
+
+    def test_02_only_username_changes_users_version(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        _, _, titles = create_comments(admin_client, author_map)
+        reviews_url = f"/api/v1/titles/{titles[0]['id']}/reviews/"
+        etag = self.check_not_modified(client, reviews_url)
+
+        user_client.patch("/api/v1/users/me/", {"bio": "Новая биография"})
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            "Проверьте, что правка профиля без смены имени не меняет ETag "
+            "отзывов."
+        )
+
+        user.refresh_from_db()
+        user.username = "RenamedUser"
+        user.save()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert (
+            response.status_code == HTTPStatus.OK
+        ), "Проверьте, что смена имени автора меняет ETag отзывов."
+
+    def test_03_review_delete_keeps_fast_cascade(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]["id"]
+        reviews_url = f"/api/v1/titles/{title_id}/reviews/"
+        etag = self.check_not_modified(client, reviews_url)
+
+        queries = []
+        for review in reviews[:2]:
+            comments_url = f"{reviews_url}{review['id']}/comments/"
+            for number in range(5 * len(queries)):
+                create_single_comment(
+                    admin_client, title_id, review["id"], f"Ещё {number}"
+                )
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.delete(f"{reviews_url}{review['id']}/")
+            assert response.status_code == HTTPStatus.NO_CONTENT
+            queries.append(len(context.captured_queries))
+            assert client.get(comments_url).status_code == (
+                HTTPStatus.NOT_FOUND
+            )
+        assert queries[0] == queries[1], (
+            "Проверьте, что комментарии удаляются каскадом одним запросом, "
+            "без сигналов на каждую строку."
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_last_modified_only_for_finished_second(
+        self, client, admin_client, monkeypatch
+    ):
+        # Позже изменений, сделанных фикстурами.
+        start = datetime.now(timezone.utc).replace(microsecond=200000)
+        start += timedelta(days=1)
+        clock = {"now": start}
+        monkeypatch.setattr("django.utils.timezone.now", lambda: clock["now"])
+        admin_client.post(
+            "/api/v1/categories/", {"name": "Фильм", "slug": "films"}
+        )
+        url = "/api/v1/titles/"
+        titles = iter(("Первое", "Второе", "Третье"))
+
+        def create_title():
+            response = admin_client.post(
+                url, {"name": next(titles), "year": 2000, "category": "films"}
+            )
+            assert response.status_code == HTTPStatus.CREATED
+
+        create_title()
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert "Last-Modified" not in response, (
+            "Проверьте, что Last-Modified не отдаётся, пока секунда "
+            "последнего изменения не закончилась."
+        )
+
+        clock["now"] = start + timedelta(milliseconds=500)
+        create_title()
+        clock["now"] = start + timedelta(seconds=2)
+        response = client.get(url)
+        last_modified = response.get("Last-Modified")
+        assert last_modified == http_date(int(start.timestamp()))
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        create_title()
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что запись после отданного Last-Modified "
+            "не даёт ответа 304."
+        )
+
+    def test_05_orm_review_delete_changes_etags(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        titles_url = "/api/v1/titles/"
+        reviews_url = f"{titles_url}{titles[0]['id']}/reviews/"
+        comments_url = f"{reviews_url}{reviews[0]['id']}/comments/"
+        titles_etag = self.check_not_modified(client, titles_url)
+        reviews_etag = self.check_not_modified(client, reviews_url)
+        comments_etag = self.check_not_modified(client, comments_url)
+
+        Review.objects.get(pk=reviews[0]["id"]).delete()
+        for url, etag in (
+            (titles_url, titles_etag),
+            (reviews_url, reviews_etag),
+            (comments_url, comments_etag),
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code != HTTPStatus.NOT_MODIFIED, (
+                "Проверьте, что удаление отзыва в обход API меняет ETag "
+                f"`{url}`."
+            )
@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitlesCache:
+    url = "/api/v1/titles/"
+
+    def test_01_cache_hit_and_invalidation(
+        self, client, admin_client, user_client
+    ):
+        from api.views import TitleViewSet
+
+        titles, _, genres = create_titles(admin_client)
+        params = {"genre": genres[0]["slug"], "year": 1984}
+
+        response = client.get(self.url, params)
+        assert response["X-Cache"] == "MISS"
+        first = response.json()
+        response = client.get(self.url, dict(reversed(params.items())))
+        assert response["X-Cache"] == "HIT", (
+            "Проверьте, что повторный запрос к списку произведений с теми "
+            "же фильтрами берётся из кэша."
+        )
+        assert response.json() == first
+        assert TitleViewSet.get_cache_stats() == {"hits": 1, "misses": 1}
+
+        create_single_review(user_client, titles[0]["id"], "Отзыв", 7)
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK
+        assert (
+            response["X-Cache"] == "MISS"
+        ), "Проверьте, что новый отзыв сбрасывает кэш списка произведений."
+        assert response.json()["results"][0]["rating"] == 7
+
+        admin_client.patch(
+            f'{self.url}{titles[0]["id"]}/', data={"genre": genres[2]["slug"]}
+        )
+        response = client.get(self.url, params)
+        assert response["X-Cache"] == "MISS"
+        assert response.json()["results"] == []
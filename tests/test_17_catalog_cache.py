@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CatalogCache:
+    def test_01_title_write_uses_cache(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = {
+            "name": "Терминатор",
+            "year": 1984,
+            "genre": [genre["slug"] for genre in genres],
+            "category": categories[0]["slug"],
+        }
+        admin_client.post("/api/v1/titles/", data=data)
+
+        data["name"] = "Терминатор 2"
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post("/api/v1/titles/", data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        slug_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if '."slug" =' in query["sql"]
+        ]
+        assert slug_queries == [], (
+            "Проверьте, что slug жанров и категорий при записи произведения "
+            "берутся из кэша справочников."
+        )
+        assert response.json()["category"] == categories[0]
+
+    def test_02_cache_follows_writes(self, client, admin_client):
+        categories = create_categories(admin_client)
+        create_genre(admin_client)
+        data = {"name": "Ламповый", "year": 1999, "category": "films"}
+        data["genre"] = ["horror"]
+        admin_client.post("/api/v1/titles/", data=data)
+
+        admin_client.post(
+            "/api/v1/genres/", data={"name": "Нуар", "slug": "noir"}
+        )
+        response = admin_client.post(
+            "/api/v1/titles/",
+            data={**data, "name": "Новый", "genre": ["noir"]},
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            "Проверьте, что новый жанр сразу доступен при записи "
+            "произведения."
+        )
+
+        admin_client.delete(f'/api/v1/categories/{categories[1]["slug"]}/')
+        response = admin_client.post(
+            "/api/v1/titles/", data={**data, "category": categories[1]["slug"]}
+        )
+        assert (
+            response.status_code == HTTPStatus.BAD_REQUEST
+        ), "Проверьте, что удалённая категория не находится в кэше."
+
+        response = client.get("/api/v1/titles/", {"genre": "noir"})
+        assert [item["name"] for item in response.json()["results"]] == [
+            "Новый"
+        ]
+        response = client.get("/api/v1/titles/", {"category": "unknown"})
+        assert response.json()["results"] == []
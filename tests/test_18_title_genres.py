@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleGenres:
+    def create_title(self, admin_client, genres):
+        categories = create_categories(admin_client)
+        data = {
+            "name": "Терминатор",
+            "year": 1984,
+            "genre": genres,
+            "category": categories[0]["slug"],
+        }
+        response = admin_client.post("/api/v1/titles/", data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        return response.json()
+
+    def test_01_unknown_slugs_reported_together(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = {
+            "name": "Терминатор",
+            "year": 1984,
+            "genre": [genres[0]["slug"], "unknown", "missing"],
+            "category": categories[0]["slug"],
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post("/api/v1/titles/", data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()["genre"]
+        assert len(errors) == 2 and "unknown" in errors[0], (
+            "Проверьте, что в ответе перечислены все неизвестные slug "
+            "жанров, а не только первый."
+        )
+        assert "missing" in errors[1]
+        lookups = [
+            query["sql"]
+            for query in context.captured_queries
+            if '"reviews_genre"' in query["sql"] and " IN " in query["sql"]
+        ]
+        assert len(lookups) == 1, (
+            "Проверьте, что отсутствующие в кэше slug жанров проверяются "
+            "одним запросом IN."
+        )
+
+    def test_02_genres_diff(self, admin_client):
+        genres = [genre["slug"] for genre in create_genre(admin_client)]
+        title = self.create_title(admin_client, genres[:2])
+
+        response = admin_client.patch(
+            f'/api/v1/titles/{title["id"]}/',
+            data={"genre": [genres[1], genres[2], genres[1]]},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert sorted(
+            genre["slug"] for genre in response.json()["genre"]
+        ) == sorted(
+            genres[1:3]
+        ), "Проверьте, что PATCH заменяет жанры произведения."
+
+        with CaptureQueriesContext(connection) as context:
+            admin_client.patch(
+                f'/api/v1/titles/{title["id"]}/',
+                data={"genre": genres[1:3]},
+            )
+        writes = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith(("INSERT", "DELETE"))
+            and "reviews_title_genre" in query["sql"]
+        ]
+        assert (
+            writes == []
+        ), "Проверьте, что неизменённый набор жанров не перезаписывается."
+
+    def test_03_genres_not_touched_without_field(self, admin_client):
+        genres = [genre["slug"] for genre in create_genre(admin_client)]
+        title = self.create_title(admin_client, genres[:2])
+        response = admin_client.patch(
+            f'/api/v1/titles/{title["id"]}/', data={"year": 1985}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert (
+            len(response.json()["genre"]) == 2
+        ), "Проверьте, что PATCH без жанров не меняет их."
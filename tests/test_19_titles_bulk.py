@@ -0,0 +1,129 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitlesBulk:
+    url = "/api/v1/titles/bulk/"
+
+    def post(self, client, items, ndjson=False):
+        if ndjson:
+            body = "\n".join(json.dumps(item) for item in items)
+            content_type = "application/x-ndjson"
+        else:
+            body = json.dumps(items)
+            content_type = "application/json"
+        return client.post(self.url, data=body, content_type=content_type)
+
+    def test_01_only_admin(self, client, user_client):
+        assert self.post(client, []).status_code == HTTPStatus.UNAUTHORIZED
+        assert self.post(user_client, []).status_code == HTTPStatus.FORBIDDEN
+
+    def test_02_create_and_update(self, client, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        items = [
+            {
+                "name": f"Фильм {number}",
+                "year": 2000 + number,
+                "genre": ["horror", "comedy"],
+                "category": "films",
+            }
+            for number in range(20)
+        ]
+        response = self.post(admin_client, items)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert (
+            data["created"] == 20 and data["error"] == 0
+        ), "Проверьте, что массовая загрузка создаёт все произведения."
+        ids = [result["id"] for result in data["results"]]
+        assert len(set(ids)) == 20
+
+        updates = [
+            {"id": ids[0], "name": "Новое имя", "genre": ["drama"]},
+            {"id": 10**6, "name": "С id", "year": 1999},
+            {"name": "Без года"},
+            {"id": ids[1], "genre": ["unknown", "horror", "missing"]},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.post(admin_client, updates, ndjson=True)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        statuses = [result["status"] for result in data["results"]]
+        assert statuses == [
+            "updated",
+            "created",
+            "error",
+            "error",
+        ], "Проверьте, что для каждого элемента возвращается свой статус."
+        assert "year" in data["results"][2]["errors"]
+        assert len(data["results"][3]["errors"]["genre"]) == 2
+        assert data["results"][1]["id"] == 10**6
+        assert (
+            len(context.captured_queries) < 25
+        ), "Проверьте, что пачка сохраняется фиксированным числом запросов."
+
+        title = client.get(f"/api/v1/titles/{ids[0]}/").json()
+        assert title["name"] == "Новое имя"
+        assert title["year"] == 2000
+        assert [genre["slug"] for genre in title["genre"]] == ["drama"]
+        title = client.get(f"/api/v1/titles/{ids[1]}/").json()
+        assert len(title["genre"]) == 2
+
+        response = client.get("/api/v1/titles/", {"search": "Новое"})
+        assert response.json()["count"] == 1, (
+            "Проверьте, что загруженные произведения попадают "
+            "в поисковый индекс."
+        )
+
+    def test_03_invalid_body(self, admin_client):
+        response = self.post(admin_client, {"name": "Один"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.url,
+            data='{"name": "a"}\n{oops',
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_invalid_ids(self, admin_client):
+        create_categories(admin_client)
+        response = self.post(admin_client, [{"name": "Фильм", "year": 2000}])
+        title_id = response.json()["results"][0]["id"]
+
+        items = [
+            {"id": [title_id], "name": "Список"},
+            {"id": {"pk": 1}, "name": "Объект"},
+            {"id": -1, "name": "Отрицательный", "year": 2000},
+            {"id": True, "name": "Логический", "year": 2000},
+            {"id": str(title_id), "name": "Строка"},
+            {"name": "Новый", "year": 2001},
+        ]
+        response = self.post(admin_client, items)
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что некорректный id — ошибка элемента, "
+            "а не всего запроса."
+        )
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [
+            "error",
+            "error",
+            "error",
+            "error",
+            "updated",
+            "created",
+        ]
+        assert all("id" in result["errors"] for result in results[:4])
+        assert results[4]["id"] == title_id, (
+            "Проверьте, что id-строка обновляет существующее произведение, "
+            "а не создаёт новое."
+        )
+        response = admin_client.get(f"/api/v1/titles/{title_id}/")
+        assert response.json()["name"] == "Строка"
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Title
+from tests.utils import create_titles
+
+EXPORT_URL = "/api/v1/titles/export/"
+
+
+def read_stream(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitlesExport:
+    def test_01_only_admin(self, client, user_client):
+        assert client.get(EXPORT_URL).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(EXPORT_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_02_ndjson(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = {"text": "Отзыв", "score": 7}
+        user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/', data=review
+        )
+
+        response = admin_client.get(EXPORT_URL, {"output": "ndjson"})
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, "Проверьте, что выгрузка отдаётся потоком."
+        rows = [
+            json.loads(line)
+            for line in read_stream(response).split("\n")
+            if line
+        ]
+        assert [row["id"] for row in rows] == sorted(
+            title["id"] for title in titles
+        )
+        row = next(row for row in rows if row["id"] == titles[0]["id"])
+        assert row["rating"] == 7 and row["rating_count"] == 1
+        assert sorted(row["genre"]) == sorted(titles[0]["genre"])
+        assert row["category"] == titles[0]["category"]
+
+    def test_03_csv_and_command(self, admin_client, tmp_path):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.get(EXPORT_URL)
+        assert response["Content-Type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert len(rows) == len(titles)
+        assert list(rows[0])[:5] == [
+            "id",
+            "name",
+            "year",
+            "description",
+            "category_id",
+        ], "Проверьте, что первые колонки CSV совпадают с titles.csv."
+
+        path = tmp_path / "titles.csv"
+        call_command(
+            "export_titles", "--output", str(path), "--chunk-size", "1"
+        )
+        with open(path, encoding="utf-8", newline="") as exported:
+            assert list(csv.DictReader(exported)) == rows, (
+                "Проверьте, что команда export_titles выгружает "
+                "те же данные, что и эндпоинт."
+            )
+
+    def test_04_round_trip_through_filling_db(self, admin_client, tmp_path):
+        titles, _, _ = create_titles(admin_client)
+        path = tmp_path / "titles.csv"
+        call_command("export_titles", "--output", str(path))
+        expected = admin_client.get("/api/v1/titles/").json()["results"]
+
+        # Убираем жанры и правим имя: загрузка должна всё вернуть.
+        Title.genre.through.objects.all().delete()
+        Title.objects.filter(pk=titles[0]["id"]).update(name="Другое")
+        call_command(
+            "filling_db", "--path", str(tmp_path), stdout=io.StringIO()
+        )
+        response = admin_client.get("/api/v1/titles/")
+        assert response.json()["results"] == expected, (
+            "Проверьте, что выгрузку export_titles можно загрузить "
+            "командой filling_db."
+        )
+
+        path.write_text("id,name,year,unknown\n1,Фильм,2000,x\n")
+        with pytest.raises(CommandError, match="unknown"):
+            call_command(
+                "filling_db", "--path", str(tmp_path), stdout=io.StringIO()
+            )
+
+    def test_04_bad_format(self, admin_client):
+        response = admin_client.get(EXPORT_URL, {"output": "xml"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,92 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.renderers import FastJSONRenderer
+from api.serializers import (
+    CompiledRepresentationMixin,
+    ReviewSerializer,
+    TitleOnlyReadSerializer,
+)
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21FastRender:
+    def plain(self, serializer_class, objects):
+        CompiledRepresentationMixin.compiled_representation = False
+        try:
+            return json.loads(
+                JSONRenderer().render(
+                    serializer_class(objects, many=True).data
+                )
+            )
+        finally:
+            CompiledRepresentationMixin.compiled_representation = True
+
+    def test_01_same_output(self, admin_client, admin, user_client, user):
+        create_reviews(admin_client, {admin: admin_client, user: user_client})
+        for serializer_class, objects in (
+            (TitleOnlyReadSerializer, Title.objects.all()),
+            (ReviewSerializer, Review.objects.all()),
+        ):
+            fast = FastJSONRenderer().render(
+                serializer_class(objects, many=True).data
+            )
+            assert json.loads(fast) == self.plain(serializer_class, objects), (
+                "Проверьте, что быстрый путь сериализации и рендеринга "
+                "даёт тот же JSON, что и DRF."
+            )
+
+    def test_02_api_json(self, admin_client):
+        response = admin_client.get("/api/v1/titles/")
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/json"
+        response = admin_client.get(
+            "/api/v1/titles/", HTTP_ACCEPT="application/json; indent=4"
+        )
+        assert (
+            b"\n    " in response.content
+        ), "Проверьте, что отступы по запросу клиента сохраняются."
+
+    def test_03_plan_cached_per_class(
+        self, admin_client, admin, user_client, user, monkeypatch
+    ):
+        create_reviews(admin_client, {admin: admin_client, user: user_client})
+        compiled = []
+        compile_field = CompiledRepresentationMixin.compile_field
+
+        def counting(model, field):
+            compiled.append(field.field_name)
+            return compile_field(model, field)
+
+        monkeypatch.setattr(
+            CompiledRepresentationMixin,
+            "compile_field",
+            staticmethod(counting),
+        )
+        monkeypatch.setattr(
+            ReviewSerializer, "_representation_plans", {}, raising=False
+        )
+        reviews = list(Review.objects.all())
+        for review in reviews:
+            ReviewSerializer(review).data
+        fields = list(ReviewSerializer().fields)
+        assert sorted(compiled) == sorted(fields), (
+            "Проверьте, что план сериализации строится один раз на класс, "
+            "а не для каждого экземпляра."
+        )
+
+        request = Request(APIRequestFactory().get("/", {"fields": "id,text"}))
+        data = ReviewSerializer(reviews[0], context={"request": request}).data
+        assert set(data) == {"id", "text"}
+        assert (
+            len(compiled) == len(fields) + 2
+        ), "Проверьте, что другой набор полей получает свой план."
+        assert set(ReviewSerializer(reviews[0]).data) == set(fields)
+        assert len(compiled) == len(fields) + 2
@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ValuesList:
+    def compare(self, client, monkeypatch, viewset, url, params=None):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        with monkeypatch.context() as patch:
+            patch.setattr(viewset, "values_reader", None)
+            cache.clear()
+            expected = client.get(url, params).json()
+        assert response.json() == expected, (
+            f"Проверьте, что список `{url}` из values() совпадает "
+            "с ответом сериализатора."
+        )
+        return expected
+
+    def test_01_same_as_serializer(
+        self, admin_client, admin, user_client, user, monkeypatch
+    ):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]["id"]
+        review_id = reviews[0]["id"]
+
+        data = self.compare(
+            admin_client, monkeypatch, TitleViewSet, "/api/v1/titles/"
+        )
+        assert data["count"] == len(titles)
+        self.compare(
+            admin_client,
+            monkeypatch,
+            TitleViewSet,
+            "/api/v1/titles/",
+            {"genre": titles[0]["genre"][0]},
+        )
+        reviews_url = f"/api/v1/titles/{title_id}/reviews/"
+        self.compare(admin_client, monkeypatch, ReviewViewSet, reviews_url)
+        self.compare(
+            admin_client,
+            monkeypatch,
+            ReviewViewSet,
+            reviews_url,
+            {"pagination": "cursor", "page_size": 1},
+        )
+        self.compare(
+            admin_client,
+            monkeypatch,
+            CommentViewSet,
+            f"{reviews_url}{review_id}/comments/",
+        )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23SparseFields:
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), [
+            query["sql"] for query in context.captured_queries
+        ]
+
+    def test_01_titles(self, admin_client, admin, user_client, user):
+        _, _, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        data, queries = self.get(
+            admin_client, "/api/v1/titles/", {"fields": "id,name,rating"}
+        )
+        assert list(data["results"][0]) == ["id", "name", "rating"], (
+            "Проверьте, что ?fields= оставляет только перечисленные поля "
+            "в порядке сериализатора."
+        )
+        assert not any(
+            "reviews_title_genre" in sql for sql in queries
+        ), "Проверьте, что жанры не запрашиваются, если их нет в ответе."
+        assert not any(
+            '"description"' in sql for sql in queries
+        ), "Проверьте, что из базы читаются только нужные колонки."
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        data, queries = self.get(
+            admin_client, url, {"omit": "description,genre"}
+        )
+        assert list(data) == ["id", "name", "year", "rating", "category"]
+        assert not any("reviews_title_genre" in sql for sql in queries)
+
+        response = admin_client.get("/api/v1/titles/", {"fields": "secret"})
+        assert (
+            response.status_code == HTTPStatus.BAD_REQUEST
+        ), "Проверьте, что неизвестное поле в ?fields= даёт ошибку 400."
+
+    def test_02_reviews_comments(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data, queries = self.get(admin_client, url, {"fields": "id,score"})
+        assert list(data["results"][0]) == ["id", "score"]
+        assert not any("reviews_comment" in sql for sql in queries), (
+            "Проверьте, что комментарии не запрашиваются, "
+            "если их нет в ответе."
+        )
+        data, _ = self.get(
+            admin_client,
+            url,
+            {"comments_limit": 1, "fields": "id,comments_count"},
+        )
+        assert list(data["results"][0]) == ["id", "comments_count"]
+
+        data, _ = self.get(
+            admin_client,
+            f'{url}{reviews[0]["id"]}/',
+            {"omit": "comments"},
+        )
+        assert "comments" not in data and "text" in data
+
+        data, _ = self.get(
+            admin_client,
+            f'{url}{reviews[0]["id"]}/comments/',
+            {"omit": "author,pub_date"},
+        )
+        assert list(data["results"][0]) == ["id", "text"]
+
+    def test_03_users(self, admin_client, admin):
+        data, queries = self.get(
+            admin_client, "/api/v1/users/", {"fields": "username,role"}
+        )
+        assert list(data["results"][0]) == ["username", "role"]
+        page_query = next(
+            sql for sql in queries if "users_user" in sql and "ORDER BY" in sql
+        )
+        assert '"bio"' not in page_query and '"email"' not in page_query, (
+            "Проверьте, что ?fields= сужает запрос пользователей "
+            "до нужных колонок."
+        )
+        data, _ = self.get(
+            admin_client, f"/api/v1/users/{admin.username}/", {"omit": "bio"}
+        )
+        assert "bio" not in data and "email" in data
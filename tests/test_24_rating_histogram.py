@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from reviews.ratings import HISTOGRAM_COLUMNS, recalculate_ratings
+from tests.utils import create_reviews
+
+
+def histogram(**counts):
+    return {str(score): counts.get(f"s{score}", 0) for score in range(1, 11)}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24RatingHistogram:
+    def test_01_histogram_follows_reviews(
+        self, client, admin_client, admin, user_client, user
+    ):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]["id"]
+        url = f"/api/v1/titles/{title_id}/rating/"
+        reviews_url = f"/api/v1/titles/{title_id}/reviews/"
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "scores": histogram(s5=2),
+            "mean": 5.0,
+            "count": 2,
+        }
+        assert (
+            len(context.captured_queries) == 1
+        ), "Проверьте, что статистика читается одним запросом."
+
+        user_client.patch(f'{reviews_url}{reviews[1]["id"]}/', {"score": 8})
+        assert client.get(url).json() == {
+            "scores": histogram(s5=1, s8=1),
+            "mean": 6.5,
+            "count": 2,
+        }, "Проверьте, что гистограмма обновляется при изменении оценки."
+
+        admin_client.delete(f'{reviews_url}{reviews[0]["id"]}/')
+        assert client.get(url).json() == {
+            "scores": histogram(s8=1),
+            "mean": 8.0,
+            "count": 1,
+        }
+
+        stored = Title.objects.values(*HISTOGRAM_COLUMNS).get(pk=title_id)
+        Title.objects.update(**dict.fromkeys(HISTOGRAM_COLUMNS, 0))
+        recalculate_ratings()
+        assert (
+            Title.objects.values(*HISTOGRAM_COLUMNS).get(pk=title_id) == stored
+        ), "Проверьте, что пересчёт восстанавливает гистограмму оценок."
+
+    def test_02_empty_and_missing(self, client, admin_client):
+        response = admin_client.post(
+            "/api/v1/categories/", {"name": "Фильм", "slug": "films"}
+        )
+        response = admin_client.post(
+            "/api/v1/titles/",
+            {"name": "Без отзывов", "year": 2000, "category": "films"},
+        )
+        url = f'/api/v1/titles/{response.json()["id"]}/rating/'
+        assert client.get(url).json() == {
+            "scores": histogram(),
+            "mean": None,
+            "count": 0,
+        }
+        response = client.get("/api/v1/titles/999999/rating/")
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title, TitleRanking
+from reviews.rankings import refresh_rankings
+from users.models import User
+
+TITLES_URL = "/api/v1/titles/"
+TOP_URL = "/api/v1/titles/top/"
+
+
+@pytest.fixture
+def ranked_titles(db):
+    films = Category.objects.create(name="Фильм", slug="films")
+    books = Category.objects.create(name="Книга", slug="books")
+    drama = Genre.objects.create(name="Драма", slug="drama")
+    titles = {
+        name: Title.objects.create(name=name, year=2000, category=category)
+        for name, category in (
+            ("Один отзыв", films),
+            ("Три отзыва", films),
+            ("Плохое", books),
+            ("Без отзывов", books),
+        )
+    }
+    titles["Один отзыв"].genre.set([drama])
+    titles["Плохое"].genre.set([drama])
+    authors = [
+        User.objects.create(
+            username=f"critic{i}", email=f"critic{i}@yamdb.fake"
+        )
+        for i in range(3)
+    ]
+    for name, scores in (
+        ("Один отзыв", [10]),
+        ("Три отзыва", [9, 9, 9]),
+        ("Плохое", [2, 3]),
+    ):
+        for author, score in zip(authors, scores):
+            Review.objects.create(
+                title=titles[name], author=author, text="Отзыв", score=score
+            )
+    return titles
+
+
+def names(data):
+    return [item["name"] for item in data]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25TitleOrderingTop:
+    def test_01_ordering(self, client, ranked_titles):
+        response = client.get(TITLES_URL, {"ordering": "-rating"})
+        assert response.status_code == HTTPStatus.OK
+        assert names(response.json()["results"]) == [
+            "Один отзыв",
+            "Три отзыва",
+            "Плохое",
+            "Без отзывов",
+        ], "Проверьте сортировку произведений по средней оценке."
+
+        response = client.get(TITLES_URL, {"ordering": "-reviews_count"})
+        assert names(response.json()["results"]) == [
+            "Три отзыва",
+            "Плохое",
+            "Один отзыв",
+            "Без отзывов",
+        ], "Проверьте сортировку произведений по числу отзывов."
+
+        response = client.get(TITLES_URL, {"ordering": "rating"})
+        assert names(response.json()["results"])[0] == "Без отзывов"
+
+        response = client.get(TITLES_URL, {"ordering": "unknown"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_rating_mean_follows_reviews(self, ranked_titles):
+        title = ranked_titles["Плохое"]
+        title.refresh_from_db()
+        assert title.rating_mean == 2.5
+        Review.objects.filter(title=title, score=2).delete()
+        title.refresh_from_db()
+        assert (
+            title.rating_mean == 3.0
+        ), "Проверьте, что средняя оценка пересчитывается при удалении отзыва."
+
+    def test_03_top(self, client, ranked_titles):
+        response = client.get(TOP_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert (
+            response.json() == []
+        ), "Проверьте, что топ пуст, пока рейтинги не построены."
+
+        call_command("refresh_rankings", prior=10)
+        # Средняя по всем отзывам 7: у «Один отзыв» (80/11) единственная
+        # десятка весит меньше трёх девяток «Три отзыва» (97/13).
+        client.get(TOP_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(TOP_URL)
+        data = response.json()
+        assert names(data) == ["Три отзыва", "Один отзыв", "Плохое"]
+        assert [item["score"] for item in data] == [7.46, 7.27, 6.25]
+        assert data[0]["category"] == {"name": "Фильм", "slug": "films"}
+        assert (
+            len(context.captured_queries) <= 3
+        ), "Проверьте, что топ читается без запроса на каждое произведение."
+
+        response = client.get(TOP_URL, {"category": "books"})
+        assert names(response.json()) == ["Плохое"]
+        response = client.get(TOP_URL, {"genre": "drama", "limit": 1})
+        assert names(response.json()) == ["Один отзыв"]
+        response = client.get(TOP_URL, {"fields": "id,name"})
+        assert response.json()[0] == {
+            "id": ranked_titles["Три отзыва"].pk,
+            "name": "Три отзыва",
+            "score": 7.46,
+        }
+
+        response = client.get(TOP_URL, {"category": "unknown"})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get(TOP_URL, {"limit": 0})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(TOP_URL, {"category": "books", "genre": "drama"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_refresh_replaces_rankings(self, ranked_titles):
+        assert refresh_rankings(size=1, prior=0) == 4
+        assert list(
+            TitleRanking.objects.filter(scope=TitleRanking.ALL).values_list(
+                "title__name", "score"
+            )
+        ) == [("Один отзыв", 10.0)], "Без prior топ строится по средней."
+        assert refresh_rankings(size=10, prior=0) == 8
+        assert TitleRanking.objects.count() == 8
@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from core.sqlite import configure_connection, pragma_statements
+
+
+def file_connection(path):
+    return DatabaseWrapper({**connection.settings_dict, "NAME": str(path)})
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SqlitePragmas:
+    def test_01_pragmas_applied_on_connect(self, settings, tmp_path):
+        if connection.vendor == "sqlite":
+            assert pragma(connection, "busy_timeout") == int(
+                settings.SQLITE_PRAGMAS["busy_timeout"]
+            ), "Проверьте, что PRAGMA из настроек выполняются при подключении."
+
+        settings.SQLITE_PRAGMAS = {
+            "journal_mode": "wal",
+            "synchronous": "normal",
+            "busy_timeout": "1234",
+            "cache_size": "-2048",
+            "temp_store": "memory",
+            "mmap_size": "",
+        }
+        wrapper = file_connection(tmp_path / "db.sqlite3")
+        try:
+            assert (
+                pragma(wrapper, "busy_timeout") == 1234
+            ), "Проверьте, что PRAGMA выполняются на каждом новом соединении."
+            assert pragma(wrapper, "synchronous") == 1
+            assert pragma(wrapper, "cache_size") == -2048
+            assert pragma(wrapper, "temp_store") == 2
+            assert pragma(wrapper, "mmap_size") == 0
+        finally:
+            wrapper.close()
+        with sqlite3.connect(tmp_path / "db.sqlite3") as raw:
+            assert (
+                raw.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            ), "Проверьте, что режим WAL сохраняется в файле базы."
+
+    def test_02_default_journal_mode(self, settings, tmp_path):
+        settings.SQLITE_PRAGMAS = {"journal_mode": ""}
+        wrapper = file_connection(tmp_path / "db.sqlite3")
+        try:
+            assert pragma(wrapper, "journal_mode") == "delete"
+            configure_connection(wrapper, {"journal_mode": "wal"})
+            assert pragma(wrapper, "journal_mode") == "wal"
+        finally:
+            wrapper.close()
+
+    def test_03_invalid_pragmas(self):
+        assert pragma_statements(
+            {"temp_store": "memory", "mmap_size": ""}
+        ) == ["PRAGMA temp_store = memory"]
+        with pytest.raises(ImproperlyConfigured):
+            pragma_statements({"user_version": "1"})
+        with pytest.raises(ImproperlyConfigured):
+            pragma_statements({"cache_size": "1; DROP TABLE users_user"})
@@ -0,0 +1,39 @@
+import pytest
+from django.db import connection
+
+from core.connections import close_unusable_connections
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27DbConnections:
+    def test_01_unusable_connection_closed(self, monkeypatch):
+        connection.ensure_connection()
+        closed = []
+        monkeypatch.setattr(connection, "is_usable", lambda: False)
+        monkeypatch.setattr(connection, "close", lambda: closed.append(True))
+        monkeypatch.setitem(
+            connection.settings_dict, "CONN_HEALTH_CHECKS", True
+        )
+
+        close_unusable_connections()
+        assert closed, (
+            "Проверьте, что разорванное соединение закрывается перед "
+            "запросом."
+        )
+
+        closed.clear()
+        monkeypatch.setitem(
+            connection.settings_dict, "CONN_HEALTH_CHECKS", False
+        )
+        close_unusable_connections()
+        assert not closed, "Без CONN_HEALTH_CHECKS соединение не проверяется."
+
+    def test_02_usable_connection_kept(self, monkeypatch, client):
+        monkeypatch.setitem(
+            connection.settings_dict, "CONN_HEALTH_CHECKS", True
+        )
+        connection.ensure_connection()
+        raw = connection.connection
+        close_unusable_connections()
+        assert connection.connection is raw
+        assert client.get("/api/v1/categories/").status_code == 200
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+
+from core import routers
+from reviews.models import Title
+
+REPLICA = "replica_1"
+TITLES_URL = "/api/v1/titles/"
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """Файл SQLite со схемой базы в роли реплики."""
+    connections.databases[REPLICA] = {
+        **connections.databases["default"],
+        "NAME": str(tmp_path / "replica.sqlite3"),
+        "TEST": {"MIRROR": None},
+    }
+    call_command("migrate", database=REPLICA, verbosity=0)
+    settings.REPLICA_DATABASES = [REPLICA]
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+def names(response):
+    assert response.status_code == HTTPStatus.OK
+    return [item["name"] for item in response.json()["results"]]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ReplicaRouter:
+    def test_01_reads_go_to_replica(self, client, admin_client, replica):
+        admin_client.post(
+            "/api/v1/categories/", {"name": "Фильм", "slug": "films"}
+        )
+        response = admin_client.post(
+            TITLES_URL,
+            {"name": "В primary", "year": 2000, "category": "films"},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert (
+            response.cookies[routers.STICKY_COOKIE]["max-age"] == 5
+        ), "Проверьте, что после записи клиент привязывается к primary."
+        # Строка есть только в реплике: по ней видно, откуда читали.
+        Title.objects.using(replica).bulk_create(
+            [Title(name="На реплике", year=2000)]
+        )
+
+        assert names(client.get(TITLES_URL)) == [
+            "На реплике"
+        ], "Проверьте, что GET-запросы произведений читают с реплики."
+        assert names(admin_client.get(TITLES_URL)) == [
+            "В primary"
+        ], "Проверьте, что после записи клиент читает из primary."
+        response = client.get("/api/v1/categories/")
+        assert [item["slug"] for item in response.json()["results"]] == [
+            "films"
+        ], "Остальные маршруты должны читать из primary."
+
+        admin_client.cookies.pop(routers.STICKY_COOKIE)
+        assert names(admin_client.get(TITLES_URL)) == ["На реплике"]
+
+        response = client.get(TITLES_URL)
+        assert routers.STICKY_COOKIE not in response.cookies
+
+    def test_02_read_after_write_in_request(self, replica):
+        routers.reset()
+        routers.read_from_replica()
+        assert Title.objects.all().db == replica
+        Title.objects.filter(pk=0).update(name="Нет такого")
+        assert (
+            Title.objects.all().db == "default"
+        ), "Проверьте, что после записи чтения запроса идут в primary."
+        routers.read_from_replica()
+        assert Title.objects.all().db == "default"
+        routers.reset()
+
+    def test_03_without_replicas(self, client, settings):
+        settings.REPLICA_DATABASES = []
+        routers.read_from_replica()
+        assert Title.objects.all().db == "default"
+        routers.reset()
+        assert names(client.get(TITLES_URL)) == []
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from core import outbox
+from core.models import OutboxEmail
+
+BACKEND = "tests.test_29_email_outbox.FlakyBackend"
+
+
+class FlakyBackend(EmailBackend):
+    """locmem-бэкенд, который считает подключения и не доставляет
+    письма на адреса с «fail»."""
+
+    opened = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any("fail" in address for address in message.to):
+                raise ConnectionError("Сервер отклонил письмо")
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def flaky_backend(settings):
+    settings.EMAIL_BACKEND = BACKEND
+    FlakyBackend.opened = 0
+    return FlakyBackend
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29EmailOutbox:
+    def test_01_batches_share_connection(self, flaky_backend):
+        for number in range(5):
+            outbox.enqueue("Тема", "Текст", [f"user{number}@yamdb.fake"])
+
+        assert outbox.send_pending(batch_size=2) == (5, 0)
+        assert [message.to[0] for message in mail.outbox] == [
+            f"user{number}@yamdb.fake" for number in range(5)
+        ]
+        assert (
+            flaky_backend.opened == 1
+        ), "Проверьте, что все пачки отправляются через одно соединение."
+        assert set(OutboxEmail.objects.values_list("status", flat=True)) == {
+            OutboxEmail.SENT
+        }
+        assert outbox.send_pending() == (0, 0)
+
+    def test_02_retry_with_backoff(self, flaky_backend, settings):
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 3
+        email = outbox.enqueue("Тема", "Текст", ["fail@yamdb.fake"])
+        outbox.enqueue("Тема", "Текст", ["ok@yamdb.fake"])
+
+        started = timezone.now()
+        assert outbox.send_pending() == (1, 1)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.PENDING
+        assert email.attempts == 1
+        assert email.last_error == "Сервер отклонил письмо"
+        assert email.next_attempt >= started + timedelta(
+            seconds=settings.EMAIL_OUTBOX_BACKOFF
+        ), "Проверьте, что повтор откладывается."
+        assert (
+            flaky_backend.opened == 2
+        ), "Проверьте, что после ошибки соединение открывается заново."
+        assert outbox.send_pending() == (0, 0)
+
+        delays = []
+        for _ in range(2):
+            OutboxEmail.objects.filter(pk=email.pk).update(
+                next_attempt=timezone.now()
+            )
+            started = timezone.now()
+            outbox.send_pending()
+            email.refresh_from_db()
+            delays.append(email.next_attempt - started)
+        assert email.status == OutboxEmail.FAILED
+        assert email.attempts == 3
+        assert delays[0] >= timedelta(
+            seconds=2 * settings.EMAIL_OUTBOX_BACKOFF
+        )
+
+    def test_03_claim_is_exclusive(self):
+        outbox.enqueue("Тема", "Текст", ["user@yamdb.fake"])
+        claimed = outbox.claim(10)
+        assert len(claimed) == 1
+        assert (
+            outbox.claim(10) == []
+        ), "Проверьте, что захваченное письмо не достаётся другому обработчику."
+        OutboxEmail.objects.update(next_attempt=timezone.now())
+        assert (
+            len(outbox.claim(10)) == 1
+        ), "Аренда истекла — письмо снова в очереди."
+
+    def test_04_command(self, client):
+        client.post(
+            "/api/v1/auth/signup/",
+            {"email": "new@yamdb.fake", "username": "newbie"},
+        )
+        assert OutboxEmail.objects.filter(to=["new@yamdb.fake"]).exists()
+        stdout = StringIO()
+        call_command("send_outbox", stdout=stdout)
+        assert "Отправлено писем: 1" in stdout.getvalue()
+        assert "confirmation_code" in mail.outbox[-1].body
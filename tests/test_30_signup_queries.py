@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import SignUpSerializer
+from core.models import OutboxEmail
+from users.models import User
+
+SIGNUP_URL = "/api/v1/auth/signup/"
+
+
+def signup(client, **data):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(SIGNUP_URL, data)
+    # BEGIN, который пишет в лог бэкенд SQLite, запросом не считаем.
+    return response, [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"] != "BEGIN"
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30SignupQueries:
+    def test_01_new_and_existing_user(self, client):
+        data = {"email": "new@yamdb.fake", "username": "newbie"}
+        response, queries = signup(client, **data)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == data
+        assert len(queries) == 3, (
+            "Проверьте, что регистрация нового пользователя — один поиск "
+            f"и две вставки (пользователь и письмо): {queries}"
+        )
+
+        response, queries = signup(client, **data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 2, (
+            "Повторная регистрация не должна перезаписывать пользователя: "
+            f"{queries}"
+        )
+        codes = set(OutboxEmail.objects.values_list("body", flat=True))
+        assert codes == {
+            f"Ваш confirmation_code: "
+            f"{User.objects.get(username='newbie').confirmation_code} "
+        }, "Проверьте, что повторно отправляется тот же код."
+
+    def test_02_conflicts(self, client):
+        User.objects.create(username="taken", email="taken@yamdb.fake")
+
+        response, queries = signup(
+            client, email="other@yamdb.fake", username="taken"
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert list(response.json()) == ["username"]
+        assert len(queries) == 1
+
+        response, _ = signup(client, email="taken@yamdb.fake", username="new")
+        assert list(response.json()) == ["email"]
+
+        User.objects.create(username="second", email="second@yamdb.fake")
+        response, _ = signup(
+            client, email="second@yamdb.fake", username="taken"
+        )
+        assert sorted(response.json()) == ["email", "username"]
+        assert not OutboxEmail.objects.exists()
+
+    def test_03_concurrent_signup(self, client, monkeypatch):
+        User.objects.create(username="racer", email="racer@yamdb.fake")
+        # Параллельный запрос успел создать пользователя после проверки.
+        monkeypatch.setattr(SignUpSerializer, "validate", lambda self, x: x)
+        response, _ = signup(
+            client, email="racer@yamdb.fake", username="racer"
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "non_field_errors" in response.json()
+        assert User.objects.count() == 1
+        assert not OutboxEmail.objects.exists()
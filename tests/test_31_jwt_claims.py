@@ -0,0 +1,165 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+
+CATEGORIES_URL = "/api/v1/categories/"
+
+
+def get_token(user):
+    client = APIClient()
+    response = client.post(
+        "/api/v1/auth/token/",
+        {
+            "username": user.username,
+            "confirmation_code": str(user.confirmation_code),
+        },
+    )
+    assert response.status_code == HTTPStatus.OK, response.content
+    return response.json()["token"]
+
+
+def client_for(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def user_queries(context):
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if "users_user" in query["sql"]
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31JWTClaims:
+    def test_01_claims_without_user_query(self, admin):
+        token = get_token(admin)
+        claims = AccessToken(token)
+        assert claims["username"] == admin.username
+        assert claims["role"] == "admin"
+        assert claims["is_staff"] is False
+
+        client = client_for(token)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                CATEGORIES_URL, {"name": "Фильм", "slug": "films"}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert user_queries(context) == [], (
+            "Проверьте, что права проверяются по утверждениям токена "
+            "без запроса пользователя."
+        )
+
+    def test_02_full_user_loaded_on_demand(self, user, admin_client):
+        admin_client.post(CATEGORIES_URL, {"name": "Фильм", "slug": "films"})
+        title = admin_client.post(
+            "/api/v1/titles/",
+            {"name": "Фильм", "year": 2000, "category": "films"},
+        ).json()
+        client = client_for(get_token(user))
+
+        review_url = f"/api/v1/titles/{title['id']}/reviews/"
+        response = client.post(review_url, {"text": "Отзыв", "score": 7})
+        assert response.status_code == HTTPStatus.CREATED
+        review = response.json()
+        assert review["author"] == user.username
+        response = client.post(review_url, {"text": "Ещё", "score": 5})
+        assert (
+            response.status_code == HTTPStatus.BAD_REQUEST
+        ), "Проверьте, что повторный отзыв по-прежнему запрещён."
+        response = client.patch(
+            f"{review_url}{review['id']}/", {"text": "Правка"}
+        )
+        assert (
+            response.status_code == HTTPStatus.OK
+        ), "Проверьте, что автор может изменить свой отзыв."
+
+        response = client.get("/api/v1/users/me/")
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["email"] == user.email
+        response = client.patch("/api/v1/users/me/", {"bio": "Новое"})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.bio == "Новое"
+
+    def test_03_rename_through_me(self, user):
+        client = client_for(get_token(user))
+        response = client.patch("/api/v1/users/me/", {"username": "renamed"})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["username"] == "renamed"
+        response = client.get("/api/v1/users/me/")
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["username"] == "renamed", (
+            "Проверьте, что после смены имени токен не подставляет "
+            "прежнее имя пользователя."
+        )
+
+    def test_04_role_change_revokes_tokens(self, admin_client):
+        demoted = User.objects.create(
+            username="demoted", email="demoted@yamdb.fake", role="admin"
+        )
+        old_client = client_for(get_token(demoted))
+        response = old_client.post(
+            CATEGORIES_URL, {"name": "Фильм", "slug": "films"}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = admin_client.patch(
+            "/api/v1/users/demoted/", {"role": "moderator"}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = old_client.post(
+            CATEGORIES_URL, {"name": "Книга", "slug": "books"}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            "Проверьте, что после смены роли прежние токены "
+            "недействительны."
+        )
+
+        demoted.refresh_from_db()
+        token = get_token(demoted)
+        assert AccessToken(token)["role"] == "moderator"
+        client = client_for(token)
+        response = client.post(
+            CATEGORIES_URL, {"name": "Книга", "slug": "books"}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        demoted.bio = "Без смены прав"
+        demoted.save()
+        response = client.get("/api/v1/users/me/")
+        assert (
+            response.status_code == HTTPStatus.OK
+        ), "Изменение остальных полей не должно отзывать токены."
+
+    def test_05_inactive_and_deleted_users(self, user):
+        client = client_for(get_token(user))
+        user.is_active = False
+        user.save()
+        assert client.get("/api/v1/users/me/").status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        response = APIClient().post(
+            "/api/v1/auth/token/",
+            {
+                "username": user.username,
+                "confirmation_code": str(user.confirmation_code),
+            },
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        user.is_active = True
+        user.save()
+        client = client_for(get_token(user))
+        user.delete()
+        assert client.get("/api/v1/users/me/").status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )